@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmarks of the generation of the palette catalogue and of the lookups
+in the generated catalogue.
+
+Results can be saved as a baseline (--save) and compared with a previous
+baseline: the script exits with an error status when a benchmark is slower
+than its baseline by more than the given factor (--threshold) and by more
+than an absolute noise floor (--min-delta, in milliseconds), so that the
+sub-millisecond benchmarks do not fail on timing noise.
+
+Timings depend on the machine, so the baseline is not committed. To gate
+a change in CI, build the baseline on the same runner from the target
+branch, then compare the change with it:
+
+    git checkout main && python benchmarks/bench_generator.py --save --baseline /tmp/baseline.json
+    git checkout - && python benchmarks/bench_generator.py --baseline /tmp/baseline.json --require-baseline
+
+(--require-baseline makes the comparison fail if the baseline is missing,
+instead of silently skipping the gate).
+
+The --scale option builds a synthetic catalogue with N times the palettes
+of palettes.json (and N times the source ramps), to expose the parts of the
+pipeline that do not scale well before the real catalogue grows.
+
+Usage:
+    python benchmarks/bench_generator.py [--scale N] [--save] [--threshold 1.5] [--min-delta 1]
+"""
+import argparse
+import json
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import numpy as np  # noqa: E402
+
+from pydicopal import compress_colors, interpolate, parse_colors, sample, sample_all  # noqa: E402
+from pydicopal.catalogue import Catalogue  # noqa: E402
+from pydicopal.cbf import classify  # noqa: E402
+from pydicopal.extract import MODULES, extract_module  # noqa: E402
+from pydicopal.similarity import build_index, nearest_palettes  # noqa: E402
+
+GENERATOR = ROOT / 'generate-palette-descriptions.py'
+DEFAULT_BASELINE = ROOT / 'benchmarks' / 'baseline.json'
+
+
+def load_source_ramps():
+    """Read the (long) source ramps used by the generator."""
+    ramps = {}
+    for path in sorted((ROOT / 'pydicopal' / 'data').glob('*.json')):
+        with open(path) as f:
+            ramps.update({name: desc['colors'] for name, desc in json.load(f).items()})
+    return ramps
+
+
+def scale_catalogue(res, scale, seed=0):
+    """
+    Build a synthetic catalogue with `scale` times the palettes of `res`
+    (copies of each provider, with renamed palettes and jittered colors).
+    """
+    if scale <= 1:
+        return res
+    rng = np.random.default_rng(seed)
+    out = {}
+    for copy in range(scale):
+        for provider, palettes in res.items():
+            target = out.setdefault(provider if copy == 0 else f'{provider}{copy}', {})
+            for name, desc in palettes.items():
+                values = {}
+                for number, colors in desc['values'].items():
+                    rgb = parse_colors(colors).astype(np.int16)
+                    if copy:
+                        rgb = np.clip(rgb + rng.integers(-8, 9, rgb.shape), 0, 255)
+                    values[number] = compress_colors(rgb.astype(np.uint8))
+                target[name if copy == 0 else f'{name}{copy}'] = {**desc, 'values': values}
+    return out
+
+
+def measure(fn, repeat):
+    """Run `fn` once to warm up, then `repeat` times; returns the timings (in seconds)."""
+    fn()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def run_generator(*args):
+    """Run the generator (without build cache) in a temporary directory."""
+    with tempfile.TemporaryDirectory() as tmp:
+        (Path(tmp) / 'src').mkdir()
+        shutil.copy(ROOT / 'src' / 'palettes.json', Path(tmp) / 'src')
+        cmd = [sys.executable, str(GENERATOR), '--no-cache', *args]
+        subprocess.run(cmd, cwd=tmp, check=True, capture_output=True)
+
+
+def benchmarks(scale):
+    """Return the benchmarks to run, as a dict name -> callable."""
+    with open(ROOT / 'src' / 'palettes.json') as f:
+        res = scale_catalogue(json.load(f), scale)
+    ramps = list(load_source_ramps().values()) * max(scale, 1)
+    serialized = json.dumps(res, indent=4)
+    catalogue = Catalogue(res)
+    ids = [f'{name}_{number}' for p in res.values() for name, d in p.items() for number in d['values']]
+    query = ['#fee0d2', '#fc9272', '#de2d26']
+    index = build_index(res)
+
+    def decode_all():
+        for palettes in json.loads(serialized).values():
+            for desc in palettes.values():
+                for colors in desc['values'].values():
+                    parse_colors(colors)
+
+    benches = {}
+    if scale <= 1:
+        benches['regeneration (serial)'] = run_generator
+        benches['regeneration (4 workers)'] = lambda: run_generator('--workers', '4')
+        benches['refresh one provider (tableau)'] = lambda: run_generator('--providers', 'tableau')
+        for provider, kind in MODULES:
+            benches[f'extract {provider}.{kind}'.rstrip('.')] = lambda p=provider, k=kind: extract_module(p, k)
+    benches.update({
+        'sample_all (all ramps, 2-20 classes)': lambda: [sample_all(r, 20) for r in ramps],
+        'sample (all ramps, 2-20 classes, one by one)': lambda: [sample(r, n) for r in ramps for n in range(2, 21)],
+        'sample_all lab (all ramps)': lambda: [sample_all(r, 20, mode='lab') for r in ramps],
+        'interpolate (all ramps, consecutive pairs)': lambda: [
+            interpolate(a, b) for r in ramps for a, b in zip(r[:-1:8], r[1::8])
+        ],
+        'compress_colors (all ramps)': lambda: [compress_colors(r) for r in ramps],
+        'json serialization': lambda: json.dumps(res, indent=4),
+        'decode palettes.json': decode_all,
+        'cbf classification': lambda: classify(res),
+        'similarity index build': lambda: build_index(res),
+        'similarity query x100': lambda: [nearest_palettes(query, 5, index=index) for _ in range(100)],
+        'catalogue index build': lambda: Catalogue(res),
+        'get_palette_by_id (all ids)': lambda: [catalogue.get_palette_by_id(i) for i in ids],
+        'get_palettes(name=...) x100': lambda: [catalogue.get_palettes(name='Blues') for _ in range(100)],
+    })
+    return benches
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--scale', type=int, default=1, help='Size of the synthetic catalogue, as a multiple of palettes.json')
+    parser.add_argument('--repeat', type=int, default=5, help='Number of timed runs of each benchmark (default: 5)')
+    parser.add_argument('--baseline', type=Path, default=DEFAULT_BASELINE, help=f'Baseline file (default: {DEFAULT_BASELINE})')
+    parser.add_argument('--save', action='store_true', help='Save the results as the new baseline')
+    parser.add_argument(
+        '--threshold', type=float, default=1.5,
+        help='Fail when a benchmark is slower than its baseline by more than this factor (default: 1.5)',
+    )
+    parser.add_argument(
+        '--min-delta', type=float, default=1.0,
+        help='Ignore the slowdowns smaller than this duration, in milliseconds (default: 1)',
+    )
+    parser.add_argument(
+        '--require-baseline', action='store_true',
+        help='Fail when there is no baseline to compare a benchmark with',
+    )
+    parser.add_argument('-k', dest='filter', default=None, help='Only run the benchmarks whose name contains this string')
+    args = parser.parse_args()
+
+    baseline = {}
+    if args.baseline.exists():
+        with open(args.baseline) as f:
+            baseline = json.load(f).get('results', {}).get(f'scale={args.scale}', {})
+
+    results = {}
+    regressions = []
+    missing = []
+    print(f"{'benchmark':<50} {'min (ms)':>10} {'median (ms)':>12} {'baseline':>10}")
+    for name, fn in benchmarks(args.scale).items():
+        if args.filter and args.filter not in name:
+            continue
+        timings = sorted(measure(fn, args.repeat))
+        best = timings[0]
+        results[name] = {'min': best, 'median': timings[len(timings) // 2]}
+        ref = baseline.get(name, {}).get('min')
+        status = ''
+        if ref is None:
+            missing.append(name)
+        else:
+            status = f'{best / ref:>9.2f}x'
+            if best > ref * args.threshold and (best - ref) * 1000 > args.min_delta:
+                regressions.append(name)
+                status += ' REGRESSION'
+        print(f'{name:<50} {best * 1000:>10.2f} {results[name]["median"] * 1000:>12.2f} {status}')
+
+    if args.save:
+        saved = {}
+        if args.baseline.exists():
+            with open(args.baseline) as f:
+                saved = json.load(f)
+        saved['python'] = platform.python_version()
+        saved['numpy'] = np.__version__
+        saved.setdefault('results', {})[f'scale={args.scale}'] = results
+        with open(args.baseline, 'w') as f:
+            json.dump(saved, f, indent=2)
+        print(f'Baseline saved to {args.baseline}')
+
+    if regressions:
+        print(
+            f'{len(regressions)} benchmark(s) slower than {args.threshold}x their baseline '
+            f'(and by more than {args.min_delta} ms): {", ".join(regressions)}'
+        )
+        sys.exit(1)
+    if missing and args.require_baseline and not args.save:
+        print(f'No baseline in {args.baseline} for {len(missing)} benchmark(s): {", ".join(missing)}')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+"""
+Python helpers for building (and using) the dicopal palette catalogue.
+"""
+import importlib
+
+from .color import compress_colors, parse_colors, to_hex
+from .resample import interpolate, sample, sample_all, sample_all_compressed
+from .extract import MODULES, extract_all
+
+# The lookup helpers are only imported when they are used, so that the
+# generator (which imports the submodules it needs) does not load them
+_LAZY = {
+    'Catalogue': 'catalogue',
+    'get_colors': 'catalogue',
+    'get_colors_by_id': 'catalogue',
+    'get_palette': 'catalogue',
+    'get_palette_by_id': 'catalogue',
+    'get_palettes': 'catalogue',
+    'build_lut': 'lut',
+    'map_values': 'lut',
+    'nearest_palettes': 'similarity',
+}
+
+
+def __getattr__(name):
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f'.{_LAZY[name]}', __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY))
@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+"""
+Content-addressed cache for the generation of the palette descriptions.
+
+Each section of the catalogue (the palettes extracted from one palettable
+submodule, or the palettes built from inline color ramps) is stored on
+disk with the hash of everything it was computed from, so that only the
+sections whose sources changed are computed again.
+"""
+import hashlib
+import importlib.metadata
+import importlib.util
+import json
+import os
+from pathlib import Path
+
+from . import color, extract, resample
+
+# Bump this to invalidate all the existing cache entries
+CACHE_VERSION = 1
+
+DEFAULT_CACHE_DIR = Path('.cache') / 'dicopal'
+
+
+def hash_parts(*parts):
+    """Hash a sequence of JSON-serializable values and/or bytes."""
+    h = hashlib.sha256(str(CACHE_VERSION).encode())
+    for part in parts:
+        if not isinstance(part, bytes):
+            part = json.dumps(part, sort_keys=True).encode()
+        h.update(len(part).to_bytes(8, 'little'))
+        h.update(part)
+    return h.hexdigest()
+
+
+def _hash_files(directory):
+    h = hashlib.sha256()
+    for path in sorted(Path(directory).rglob('*')):
+        if not path.is_file() or '__pycache__' in path.parts:
+            continue
+        h.update(path.relative_to(directory).as_posix().encode())
+        h.update(path.read_bytes())
+    return h.digest()
+
+
+def _sources(*modules):
+    """Read the source of the given modules (the code a cached section was computed with)."""
+    return b''.join(Path(module.__file__).read_bytes() for module in modules)
+
+
+def module_key(provider, kind=''):
+    """
+    Compute the cache key of a palettable submodule, from the installed
+    version of palettable, the content of the provider's source files
+    and the source of the extraction code, including the color helpers
+    it formats the palettes with (without importing palettable).
+    """
+    spec = importlib.util.find_spec('palettable')
+    provider_dir = Path(spec.origin).parent / provider
+    return hash_parts(
+        importlib.metadata.version('palettable'),
+        provider,
+        kind,
+        _hash_files(provider_dir),
+        _sources(extract, color),
+    )
+
+
+def _restore_numbers(section):
+    # JSON object keys are strings, but the number of classes are stored as int
+    for desc in section.values():
+        desc['values'] = {int(k): v for k, v in desc['values'].items()}
+    return section
+
+
+class BuildCache:
+    """
+    Store sections of the catalogue in `directory`, one JSON file per section.
+    When `enabled` is False, nothing is read from (nor written to) the disk.
+    """
+    def __init__(self, directory=DEFAULT_CACHE_DIR, enabled=True):
+        self.directory = Path(directory)
+        self.enabled = enabled
+        self.hits = []
+        self.misses = []
+
+    def _path(self, name):
+        return self.directory / f'{name}.json'
+
+    def get(self, name, key):
+        """Return the cached section `name` if it was stored with `key`, None otherwise."""
+        if not self.enabled:
+            return None
+        try:
+            with open(self._path(name)) as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if entry.get('key') != key:
+            return None
+        return _restore_numbers(entry['section'])
+
+    def put(self, name, key, section):
+        """Store the section `name` with `key`."""
+        if not self.enabled:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self._path(name)
+        tmp = path.with_suffix('.tmp')
+        with open(tmp, 'w') as f:
+            json.dump({'key': key, 'section': section}, f)
+        os.replace(tmp, path)
+
+    def get_or_compute(self, name, key, compute):
+        """Return the cached section `name`, computing (and storing) it if needed."""
+        section = self.get(name, key)
+        if section is None:
+            self.misses.append(name)
+            section = compute()
+            self.put(name, key, section)
+        else:
+            self.hits.append(name)
+        return section
+
+
+def extract_all_cached(cache, modules=extract.MODULES, workers=None, res=None):
+    """
+    Same as `extract.extract_all` but only extracts the palettable submodules
+    whose cache key changed, reusing the cached fragments for the others.
+    """
+    if not cache.enabled:
+        return extract.extract_all(modules, workers, res)
+    res = {} if res is None else res
+    names = [f'{provider}-{kind}' if kind else provider for provider, kind in modules]
+    keys = [module_key(provider, kind) for provider, kind in modules]
+    fragments = [cache.get(name, key) for name, key in zip(names, keys)]
+
+    stale = [i for i, fragment in enumerate(fragments) if fragment is None]
+    fresh = extract.extract_fragments([modules[i] for i in stale], workers)
+    for i, fragment in zip(stale, fresh):
+        cache.put(names[i], keys[i], fragment)
+        fragments[i] = fragment
+
+    cache.hits.extend(names[i] for i in range(len(modules)) if i not in stale)
+    cache.misses.extend(names[i] for i in stale)
+
+    for (provider, _), fragment in zip(modules, fragments):
+        extract.merge_fragment(res, provider, fragment)
+    return res
+
+
+def sample_all_cached(cache, name, ramp, max_classes=20, mode='index'):
+    """
+    Same as `resample.sample_all_compressed` but reuses the palettes
+    computed for this exact ramp, maximum number of classes and mode.
+    """
+    key = hash_parts(
+        list(ramp), max_classes, mode, _sources(resample, color),
+    )
+    section = cache.get_or_compute(
+        name,
+        key,
+        lambda: {name: {'values': resample.sample_all_compressed(ramp, max_classes, mode=mode)}},
+    )
+    return section[name]['values']
+
+
+def write_if_changed(path, content):
+    """
+    Write `content` (str or bytes) to `path` unless the file already
+    has this exact content. Returns whether the file was written.
+    """
+    path = Path(path)
+    binary = isinstance(content, bytes)
+    try:
+        if (path.read_bytes() if binary else path.read_text()) == content:
+            return False
+    except OSError:
+        pass
+    if binary:
+        path.write_bytes(content)
+    else:
+        path.write_text(content)
+    return True
@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+"""
+Python counterpart of the lookup functions of dicopal
+(getPalette, getPaletteById, getPalettes, getColors and getColorsById).
+
+The palette descriptions (palettes.json, or the `res` dict built by the
+generator) are indexed once by name, type, provider and number of classes,
+and decoded colors are kept in an LRU cache, so that lookups never need
+to scan the whole catalogue.
+"""
+import json
+import re
+from functools import lru_cache
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parent.parent / 'src'
+
+_ID = re.compile(r'^(.+)_(\d+)$')
+
+
+def _decode(colors):
+    return tuple(f'#{colors[i:i + 6]}' for i in range(0, len(colors), 6))
+
+
+class Catalogue:
+    """
+    Indexed palette catalogue.
+
+    `res` is the description of the palettes (provider -> name -> {type,
+    values, url}) and `cbf` the ids of the colorblind-friendly palettes.
+    Decoded colors are cached for the `cache_size` most recently used palettes.
+    """
+    def __init__(self, res, cbf=(), cache_size=1024):
+        self.res = res
+        self.cbf = frozenset(cbf)
+        # Every palette variation, in the order of the catalogue
+        self.entries = []
+        self.by_name = {}
+        self.by_lower_name = {}
+        self.by_type = {}
+        self.by_provider = {}
+        self.by_number = {}
+        # (name, number) -> position of the first matching entry
+        self._first = {}
+
+        for provider, palettes in res.items():
+            for name, desc in palettes.items():
+                for number in desc['values']:
+                    k = len(self.entries)
+                    number = int(number)
+                    self.entries.append((provider, name, number, desc['type']))
+                    self.by_name.setdefault(name, []).append(k)
+                    self.by_lower_name.setdefault(name.lower(), []).append(k)
+                    self.by_type.setdefault(desc['type'], []).append(k)
+                    self.by_provider.setdefault(provider, []).append(k)
+                    self.by_number.setdefault(number, []).append(k)
+                    self._first.setdefault((name, number), k)
+
+        self._colors = lru_cache(maxsize=cache_size)(self._load_colors)
+
+    @classmethod
+    def from_files(cls, palettes_path=SRC_DIR / 'palettes.json', cbf_path=SRC_DIR / 'cbf.json', **kwargs):
+        """Load the catalogue from palettes.json (and cbf.json, if it exists)."""
+        with open(palettes_path) as f:
+            res = json.load(f)
+        cbf = ()
+        if cbf_path is not None and Path(cbf_path).exists():
+            with open(cbf_path) as f:
+                cbf = json.load(f)
+        return cls(res, cbf, **kwargs)
+
+    def _load_colors(self, k):
+        provider, name, number, _ = self.entries[k]
+        values = self.res[provider][name]['values']
+        colors = values[str(number)] if str(number) in values else values[number]
+        return colors if isinstance(colors, tuple) else _decode(colors) if isinstance(colors, str) else tuple(colors)
+
+    def _palette(self, k):
+        provider, name, number, type_ = self.entries[k]
+        desc = self.res[provider][name]
+        o = {
+            'id': f'{name}_{number}',
+            'name': name,
+            'number': number,
+            'type': type_,
+            'colors': list(self._colors(k)),
+            'provider': provider,
+            'url': desc.get('url'),
+        }
+        if o['id'] in self.cbf:
+            o['cbf'] = True
+        return o
+
+    def get_palette(self, name, number):
+        """Get a palette, given a name and number of classes (None if there is no such palette)."""
+        k = self._first.get((name, int(number)))
+        return None if k is None else self._palette(k)
+
+    def get_palette_by_id(self, _id):
+        """Get a palette by id ('{name}_{number}'), None if there is no such palette."""
+        m = _ID.match(_id)
+        if m is None:
+            return None
+        return self.get_palette(m.group(1), int(m.group(2)))
+
+    def get_colors(self, name, number, reverse=False):
+        """Get the colors of a palette, given its name and number of classes (None if there is no such palette)."""
+        k = self._first.get((name, int(number)))
+        if k is None:
+            return None
+        colors = self._colors(k)
+        return list(reversed(colors)) if reverse else list(colors)
+
+    def get_colors_by_id(self, _id, reverse=False):
+        """Get the colors of a palette given its id ('{name}_{number}'), None if there is no such palette."""
+        m = _ID.match(_id)
+        if m is None:
+            return None
+        return self.get_colors(m.group(1), int(m.group(2)), reverse)
+
+    def get_palettes(self, type=None, number=None, provider=None, name=None):
+        """
+        Return the palettes matching the requested criteria (all palettes if no criteria is
+        provided). Criteria are combined with AND and are case-insensitive, as in getPalettes.
+        """
+        # (index, key, test of an entry) for each requested criterion
+        criteria = []
+        if type:
+            criteria.append((self.by_type, type.lower(), lambda e, v: e[3] == v))
+        if number:
+            criteria.append((self.by_number, int(number), lambda e, v: e[2] == v))
+        if provider:
+            criteria.append((self.by_provider, provider.lower(), lambda e, v: e[0] == v))
+        if name:
+            criteria.append((self.by_lower_name, name.lower(), lambda e, v: e[1].lower() == v))
+
+        if not criteria:
+            return [self._palette(k) for k in range(len(self.entries))]
+
+        # Start from the most selective index and check the other criteria on its entries
+        criteria.sort(key=lambda c: len(c[0].get(c[1], ())))
+        (index, key, _), others = criteria[0], criteria[1:]
+        return [
+            self._palette(k) for k in index.get(key, ())
+            if all(test(self.entries[k], v) for _, v, test in others)
+        ]
+
+    def get_palette_providers(self):
+        """Return the names of the palette providers."""
+        return list(self.res)
+
+    def get_palette_names(self, provider=None):
+        """Return the names of the palettes (for all providers if no provider is specified)."""
+        if provider is None:
+            return [name for palettes in self.res.values() for name in palettes]
+        return list(self.res.get(provider, {}))
+
+    def get_palette_numbers(self, name):
+        """Return the available numbers of classes for a given palette name."""
+        return [self.entries[k][2] for k in self.by_name.get(name, ())]
+
+
+@lru_cache(maxsize=None)
+def default_catalogue():
+    """The catalogue built from the palettes.json and cbf.json files of this repository."""
+    return Catalogue.from_files()
+
+
+def get_palette(name, number):
+    """Get a palette from the default catalogue, see `Catalogue.get_palette`."""
+    return default_catalogue().get_palette(name, number)
+
+
+def get_palette_by_id(_id):
+    """Get a palette from the default catalogue, see `Catalogue.get_palette_by_id`."""
+    return default_catalogue().get_palette_by_id(_id)
+
+
+def get_colors(name, number, reverse=False):
+    """Get colors from the default catalogue, see `Catalogue.get_colors`."""
+    return default_catalogue().get_colors(name, number, reverse)
+
+
+def get_colors_by_id(_id, reverse=False):
+    """Get colors from the default catalogue, see `Catalogue.get_colors_by_id`."""
+    return default_catalogue().get_colors_by_id(_id, reverse)
+
+
+def get_palettes(type=None, number=None, provider=None, name=None):
+    """Get palettes from the default catalogue, see `Catalogue.get_palettes`."""
+    return default_catalogue().get_palettes(type, number, provider, name)
@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+"""
+Automated classification of colorblind-friendly palettes.
+
+Each palette is seen through a simulation of protanopia, deuteranopia and
+tritanopia (Machado et al., 2009, full severity) and the smallest CIEDE2000
+difference between two of its colors is computed for each of these vision
+deficiencies. All the palettes having the same number of colors are stacked
+and processed together, so the whole catalogue is classified in a handful of
+NumPy operations.
+"""
+import numpy as np
+
+from .color import linear_to_lab, parse_colors, srgb_to_linear
+
+# Simulation matrices (in linear RGB) from Machado, Oliveira & Fernandes (2009),
+# "A Physiologically-based Model for Simulation of Color Vision Deficiency"
+DEFICIENCIES = {
+    'protanopia': np.array([
+        [0.152286, 1.052583, -0.204868],
+        [0.114503, 0.786281, 0.099216],
+        [-0.003882, -0.048116, 1.051998],
+    ]),
+    'deuteranopia': np.array([
+        [0.367322, 0.860646, -0.227968],
+        [0.280085, 0.672501, 0.047413],
+        [-0.011820, 0.042940, 0.968881],
+    ]),
+    'tritanopia': np.array([
+        [1.255528, -0.076749, -0.178779],
+        [-0.078411, 0.930809, 0.147602],
+        [0.004733, 0.691367, 0.303900],
+    ]),
+}
+
+# Minimum CIEDE2000 difference, under each simulated vision deficiency,
+# between any two colors of a palette for it to be considered colorblind-friendly
+DEFAULT_THRESHOLD = 8
+
+
+def simulate(rgb, deficiency):
+    """
+    Simulate how an (..., 3) array of sRGB colors (in [0, 255]) is seen with the
+    given vision deficiency. Returns linear RGB values in [0, 1].
+    """
+    lin = srgb_to_linear(rgb)
+    return np.clip(lin @ DEFICIENCIES[deficiency].T, 0, 1)
+
+
+def ciede2000(lab1, lab2):
+    """CIEDE2000 color difference between two (broadcastable) (..., 3) arrays of CIELAB colors."""
+    L1, a1, b1 = np.moveaxis(np.asarray(lab1, dtype=np.float64), -1, 0)
+    L2, a2, b2 = np.moveaxis(np.asarray(lab2, dtype=np.float64), -1, 0)
+
+    C1 = np.hypot(a1, b1)
+    C2 = np.hypot(a2, b2)
+    C7 = ((C1 + C2) / 2) ** 7
+    G = 0.5 * (1 - np.sqrt(C7 / (C7 + 25 ** 7)))
+    a1p = (1 + G) * a1
+    a2p = (1 + G) * a2
+    C1p = np.hypot(a1p, b1)
+    C2p = np.hypot(a2p, b2)
+    h1p = np.degrees(np.arctan2(b1, a1p)) % 360
+    h2p = np.degrees(np.arctan2(b2, a2p)) % 360
+
+    dLp = L2 - L1
+    dCp = C2p - C1p
+    dhp = h2p - h1p
+    dhp = np.where(dhp > 180, dhp - 360, np.where(dhp < -180, dhp + 360, dhp))
+    dhp = np.where(C1p * C2p == 0, 0, dhp)
+    dHp = 2 * np.sqrt(C1p * C2p) * np.sin(np.radians(dhp / 2))
+
+    Lbp = (L1 + L2) / 2
+    Cbp = (C1p + C2p) / 2
+    hsum = h1p + h2p
+    hbp = np.where(
+        np.abs(h1p - h2p) > 180,
+        np.where(hsum < 360, (hsum + 360) / 2, (hsum - 360) / 2),
+        hsum / 2,
+    )
+    hbp = np.where(C1p * C2p == 0, hsum, hbp)
+
+    T = (
+        1
+        - 0.17 * np.cos(np.radians(hbp - 30))
+        + 0.24 * np.cos(np.radians(2 * hbp))
+        + 0.32 * np.cos(np.radians(3 * hbp + 6))
+        - 0.20 * np.cos(np.radians(4 * hbp - 63))
+    )
+    d_theta = 30 * np.exp(-(((hbp - 275) / 25) ** 2))
+    Cbp7 = Cbp ** 7
+    Rc = 2 * np.sqrt(Cbp7 / (Cbp7 + 25 ** 7))
+    Sl = 1 + (0.015 * (Lbp - 50) ** 2) / np.sqrt(20 + (Lbp - 50) ** 2)
+    Sc = 1 + 0.045 * Cbp
+    Sh = 1 + 0.015 * Cbp * T
+    Rt = -np.sin(np.radians(2 * d_theta)) * Rc
+
+    return np.sqrt(
+        (dLp / Sl) ** 2
+        + (dCp / Sc) ** 2
+        + (dHp / Sh) ** 2
+        + Rt * (dCp / Sc) * (dHp / Sh)
+    )
+
+
+def min_distances(palettes):
+    """
+    Smallest CIEDE2000 difference between two colors of each palette, for
+    normal vision and under each simulated vision deficiency.
+
+    `palettes` is a (P, n, 3) array of P palettes of n sRGB colors.
+    Returns a dict mapping 'normal' and each deficiency to an array of P values.
+    """
+    palettes = np.asarray(palettes)
+    i, j = np.triu_indices(palettes.shape[1], 1)
+    lin = srgb_to_linear(palettes)
+    # (1 + number of deficiencies, P, n, 3)
+    views = np.stack([lin] + [np.clip(lin @ m.T, 0, 1) for m in DEFICIENCIES.values()])
+    lab = linear_to_lab(views)
+    dist = ciede2000(lab[:, :, i], lab[:, :, j]).min(axis=-1)
+    return dict(zip(['normal', *DEFICIENCIES], dist))
+
+
+def palette_scores(res):
+    """
+    Compute the colorblind-friendliness scores of every palette variation
+    of the palette descriptions `res` (as written to palettes.json).
+
+    Returns a dict mapping each palette id ('{name}_{number}') to the smallest
+    CIEDE2000 difference between two of its colors, for normal vision and
+    under each simulated vision deficiency (in the order of `res`).
+    """
+    ids = []
+    colors = []
+    for palettes in res.values():
+        for name, desc in palettes.items():
+            for number, values in desc['values'].items():
+                ids.append(f'{name}_{number}')
+                colors.append(parse_colors(values))
+
+    # Palettes are stacked by number of colors
+    by_size = {}
+    for k, rgb in enumerate(colors):
+        by_size.setdefault(len(rgb), []).append(k)
+
+    scores = [None] * len(ids)
+    for size, members in by_size.items():
+        if size < 2:
+            continue
+        dist = min_distances(np.stack([colors[k] for k in members]))
+        for n, k in enumerate(members):
+            scores[k] = {view: round(float(d[n]), 2) for view, d in dist.items()}
+
+    return {_id: s for _id, s in zip(ids, scores) if s is not None}
+
+
+def classify(res, threshold=DEFAULT_THRESHOLD):
+    """
+    Classify the palette variations of `res` as colorblind-friendly (or not).
+
+    Returns the list of ids of the colorblind-friendly palettes (the ones
+    whose colors remain at least `threshold` apart under every simulated
+    vision deficiency) and the scores of every palette.
+    """
+    scores = palette_scores(res)
+    cbf = [
+        _id for _id, s in scores.items()
+        if all(s[deficiency] >= threshold for deficiency in DEFICIENCIES)
+    ]
+    return cbf, scores
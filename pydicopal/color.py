@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+"""
+Color conversion helpers working on (N, 3) NumPy arrays of RGB values.
+
+Colors are parsed once into uint8 arrays so that the rest of the code
+never has to manipulate hexadecimal strings one color at a time.
+"""
+import numpy as np
+
+# sRGB (D65) to CIE XYZ matrix, and its inverse
+_RGB_TO_XYZ = np.array([
+    [0.4124564, 0.3575761, 0.1804375],
+    [0.2126729, 0.7151522, 0.0721750],
+    [0.0193339, 0.1191920, 0.9503041],
+])
+_XYZ_TO_RGB = np.linalg.inv(_RGB_TO_XYZ)
+
+# Reference white (D65)
+_WHITE = np.array([0.95047, 1.0, 1.08883])
+
+_EPSILON = 216 / 24389
+_KAPPA = 24389 / 27
+
+
+def parse_colors(colors):
+    """
+    Parse colors into an (N, 3) uint8 array.
+
+    `colors` is either a sequence of '#rrggbb' strings or a compressed
+    string (the concatenation of the colors without the leading '#',
+    as stored in palettes.json).
+    """
+    if not isinstance(colors, str):
+        colors = ''.join(colors)
+    buf = bytes.fromhex(colors.replace('#', ''))
+    return np.frombuffer(buf, dtype=np.uint8).reshape(-1, 3)
+
+
+def compress_colors(colors):
+    """
+    Compress colors to the representation used in palettes.json.
+
+    `colors` is either a sequence of '#rrggbb' strings (whose case is kept)
+    or an (N, 3) array of RGB values (which are written in lowercase).
+    """
+    if isinstance(colors, np.ndarray):
+        return np.ascontiguousarray(colors, dtype=np.uint8).tobytes().hex()
+    return ''.join(colors).replace('#', '')
+
+
+def to_hex(rgb):
+    """Format an (N, 3) array of RGB values as a list of '#rrggbb' strings."""
+    h = compress_colors(rgb)
+    return [f'#{h[i:i + 6]}' for i in range(0, len(h), 6)]
+
+
+def srgb_to_linear(rgb):
+    """Convert sRGB values in [0, 255] to linear RGB values in [0, 1]."""
+    c = np.asarray(rgb, dtype=np.float64) / 255
+    return np.where(c <= 0.04045, c / 12.92, ((c + 0.055) / 1.055) ** 2.4)
+
+
+def linear_to_srgb(lin):
+    """Convert linear RGB values in [0, 1] to (unclipped) sRGB values in [0, 255]."""
+    lin = np.clip(lin, 0, 1)
+    c = np.where(lin <= 0.0031308, lin * 12.92, 1.055 * lin ** (1 / 2.4) - 0.055)
+    return c * 255
+
+
+def rgb_to_lab(rgb):
+    """Convert an (..., 3) array of sRGB values in [0, 255] to CIELAB (D65)."""
+    return linear_to_lab(srgb_to_linear(rgb))
+
+
+def linear_to_lab(lin):
+    """Convert an (..., 3) array of linear RGB values in [0, 1] to CIELAB (D65)."""
+    xyz = np.asarray(lin, dtype=np.float64) @ _RGB_TO_XYZ.T / _WHITE
+    f = np.where(xyz > _EPSILON, np.cbrt(xyz), (_KAPPA * xyz + 16) / 116)
+    return np.stack([
+        116 * f[..., 1] - 16,
+        500 * (f[..., 0] - f[..., 1]),
+        200 * (f[..., 1] - f[..., 2]),
+    ], axis=-1)
+
+
+def lab_to_rgb(lab):
+    """Convert an (..., 3) array of CIELAB (D65) values to uint8 sRGB values."""
+    lab = np.asarray(lab, dtype=np.float64)
+    fy = (lab[..., 0] + 16) / 116
+    f = np.stack([fy + lab[..., 1] / 500, fy, fy - lab[..., 2] / 200], axis=-1)
+    f3 = f ** 3
+    xyz = np.where(f3 > _EPSILON, f3, (116 * f - 16) / _KAPPA)
+    # The luminance uses L* directly below the threshold
+    xyz[..., 1] = np.where(
+        lab[..., 0] > _KAPPA * _EPSILON, f3[..., 1], lab[..., 0] / _KAPPA,
+    )
+    lin = (xyz * _WHITE) @ _XYZ_TO_RGB.T
+    return np.rint(linear_to_srgb(lin)).astype(np.uint8)
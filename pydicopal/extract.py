@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+"""
+Extraction of the palette descriptions from the 'palettable' library.
+
+Each (provider, kind) pair of palettable is extracted independently into
+a fragment, so that the extraction can be spread over several processes;
+fragments are then merged in a stable order, so the result does not depend
+on the number of workers.
+"""
+import importlib
+import importlib.util
+import re
+import sys
+import types
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+
+from .color import compress_colors
+
+# Modules of palettable that contain palettes, as (provider, kind) pairs
+MODULES = [
+    ('cartocolors', 'diverging'),
+    ('cartocolors', 'sequential'),
+    ('cartocolors', 'qualitative'),
+    ('cmocean', 'diverging'),
+    ('cmocean', 'sequential'),
+    ('colorbrewer', 'diverging'),
+    ('colorbrewer', 'qualitative'),
+    ('colorbrewer', 'sequential'),
+    ('lightbartlein', 'diverging'),
+    ('lightbartlein', 'sequential'),
+    ('matplotlib', ''),
+    ('mycarta', ''),
+    ('scientific', 'diverging'),
+    ('scientific', 'sequential'),
+    ('tableau', ''),
+    ('wesanderson', ''),
+]
+
+# Colorbrewer URL is missing in palettable palette descriptions
+COLORBREWER_URL = 'https://colorbrewer2.org/'
+
+_PALETTE_ATTR = re.compile(r'_\d')
+_NUMBER_SUFFIX = re.compile(r'_\d(\d)?$')
+
+
+def parse_palette_name(name):
+    """Split a palettable palette name into its short name and whether it is reversed."""
+    is_reversed = name.endswith('_r')
+    m = _NUMBER_SUFFIX.search(name)
+    return (name[:m.start()] if m else name), is_reversed
+
+
+@contextmanager
+def bare_palettable():
+    """
+    Within this context, the 'palettable' package is registered without running
+    its __init__ (which imports every provider, and NumPy for cubehelix), so that
+    importing one of its submodules only imports this submodule and its dependencies.
+
+    The palettable modules imported within the context are removed from
+    sys.modules when leaving it, so that a later `import palettable` gets the
+    real package. Nothing is done if palettable is already imported.
+    """
+    if 'palettable' in sys.modules:
+        yield
+        return
+    spec = importlib.util.find_spec('palettable')
+    if spec is None:
+        raise ImportError("The 'palettable' library is required to extract its palettes")
+    package = types.ModuleType('palettable')
+    package.__spec__ = spec
+    package.__file__ = spec.origin
+    package.__path__ = list(spec.submodule_search_locations)
+    package.__package__ = 'palettable'
+    sys.modules['palettable'] = package
+    try:
+        yield
+    finally:
+        for name in [m for m in sys.modules if m == 'palettable' or m.startswith('palettable.')]:
+            del sys.modules[name]
+
+
+def import_module(provider, kind=''):
+    """Import the palettable submodule for the given provider and kind."""
+    path = f'palettable.{provider}.{kind}' if kind else f'palettable.{provider}'
+    return importlib.import_module(path)
+
+
+def extract_module(provider, kind=''):
+    """
+    Extract the description of the palettes of a palettable submodule.
+
+    Returns a dict mapping the short name of each palette to its type,
+    its values (number of classes -> compressed colors) and its url.
+    """
+    module = import_module(provider, kind)
+    res = {}
+
+    for attr in dir(module):
+        if not _PALETTE_ATTR.search(attr):
+            continue
+        pal = getattr(module, attr)
+
+        short_name, is_reversed = parse_palette_name(pal.name)
+        # We dont store the reversed version of the palettes
+        if is_reversed:
+            continue
+
+        desc = res.get(short_name)
+        if desc is None:
+            desc = res[short_name] = {'type': pal.type, 'values': {}}
+
+        desc['values'][pal.number] = compress_colors(pal.hex_colors)
+
+        if hasattr(pal, 'url') and not desc.get('url'):
+            desc['url'] = pal.url
+        elif provider == 'colorbrewer':
+            desc['url'] = COLORBREWER_URL
+
+    return res
+
+
+def _extract_module(args):
+    return extract_module(*args)
+
+
+def merge_fragment(res, provider, fragment):
+    """Merge the palettes extracted from one palettable submodule into `res`."""
+    target = res.setdefault(provider, {})
+    for short_name, desc in fragment.items():
+        existing = target.get(short_name)
+        if existing is None:
+            target[short_name] = desc
+            continue
+        existing['values'].update(desc['values'])
+        if desc.get('url') and not existing.get('url'):
+            existing['url'] = desc['url']
+
+
+def extract_fragments(modules, workers=None):
+    """
+    Extract the palettes of each of the given palettable submodules,
+    in a pool of `workers` processes if `workers` > 1.
+
+    Returns the fragments in the order of `modules`.
+    """
+    if workers is not None and workers > 1 and len(modules) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(modules))) as executor:
+            return list(executor.map(_extract_module, modules))
+    return [extract_module(provider, kind) for provider, kind in modules]
+
+
+def extract_all(modules=MODULES, workers=None, res=None):
+    """
+    Extract the palettes of all the given palettable submodules.
+
+    With `workers` > 1, submodules are extracted in a pool of processes.
+    Fragments are always merged in the order of `modules`, so the result
+    is identical to the one of a serial extraction.
+    """
+    res = {} if res is None else res
+    fragments = extract_fragments(modules, workers)
+    for (provider, _), fragment in zip(modules, fragments):
+        merge_fragment(res, provider, fragment)
+    return res
@@ -0,0 +1,374 @@
+# -*- coding: utf-8 -*-
+"""
+256-entry lookup tables (LUT) for the sequential and diverging palettes,
+and bulk mapping of values (rasters, large choropleths) to colors.
+
+LUTs are stored in a single (P, 256, 3) uint8 .npy file (so that it can be
+memory-mapped) next to a JSON file giving the row of each palette name.
+Values are mapped to colors by a single vectorized gather in a LUT.
+"""
+import io
+import json
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+
+from .cache import write_if_changed
+from .catalogue import SRC_DIR, default_catalogue
+from .color import parse_colors, to_hex
+from .resample import sample_all
+
+LUT_SIZE = 256
+
+DEFAULT_LUT_PATH = SRC_DIR / 'luts.npy'
+
+
+def build_lut(colors, size=LUT_SIZE):
+    """
+    Build a (size, 3) uint8 LUT by linear interpolation (in sRGB, as
+    d3-interpolate does) between the given colors.
+    """
+    rgb = colors if isinstance(colors, np.ndarray) else parse_colors(colors)
+    return sample_all(rgb, size, size, mode='rgb')[size]
+
+
+def build_luts(res, ramps=None, types=('sequential', 'diverging'), size=LUT_SIZE):
+    """
+    Build the LUT of every palette of `res` whose type is in `types`, from
+    its raw color ramp when it is in `ramps` (a dict name -> colors) or
+    otherwise from its longest available variation.
+
+    Returns the palette names and a (P, size, 3) uint8 array. When a name is
+    used by several providers, the first one wins (as in getPalette).
+    """
+    ramps = ramps or {}
+    names = []
+    luts = []
+    for palettes in res.values():
+        for name, desc in palettes.items():
+            if desc['type'] not in types or name in names:
+                continue
+            if name in ramps:
+                colors = ramps[name]
+            else:
+                values = desc['values']
+                colors = values[max(values, key=int)]
+            names.append(name)
+            luts.append(build_lut(colors, size))
+    return names, np.stack(luts) if luts else np.zeros((0, size, 3), np.uint8)
+
+
+def write_luts(names, luts, path=DEFAULT_LUT_PATH):
+    """
+    Write the LUTs to `path` (.npy) and the row of each palette
+    name to the JSON file with the same name.
+
+    Returns the paths of the files that were actually (re)written.
+    """
+    path = Path(path)
+    buf = io.BytesIO()
+    np.save(buf, np.ascontiguousarray(luts, dtype=np.uint8))
+    outputs = [
+        (path, buf.getvalue()),
+        (path.with_suffix('.json'), json.dumps({name: i for i, name in enumerate(names)})),
+    ]
+    return [p for p, content in outputs if write_if_changed(p, content)]
+
+
+@lru_cache(maxsize=None)
+def load_luts(path=DEFAULT_LUT_PATH):
+    """Memory-map the LUTs written by `write_luts`. Returns the name -> row index and the LUTs."""
+    path = Path(path)
+    with open(path.with_suffix('.json')) as f:
+        index = json.load(f)
+    return index, np.load(path, mmap_mode='r')
+
+
+def get_lut(name, path=DEFAULT_LUT_PATH):
+    """
+    Get the LUT of a palette, from the LUT file if it exists,
+    otherwise from the longest variation of the palette.
+    """
+    if Path(path).exists():
+        index, luts = load_luts(path)
+        if name in index:
+            return np.asarray(luts[index[name]])
+    numbers = default_catalogue().get_palette_numbers(name)
+    if not numbers:
+        raise ValueError(f'No palette found for {name}')
+    return build_lut(default_catalogue().get_colors(name, max(numbers)))
+
+
+def _as_lut(palette):
+    if isinstance(palette, str):
+        return get_lut(palette)
+    palette = np.asarray(palette) if isinstance(palette, np.ndarray) else parse_colors(palette)
+    return palette if len(palette) == LUT_SIZE else build_lut(palette)
+
+
+def sample_lut(lut, positions):
+    """Pick the colors of a LUT at the given positions (in [0, 1])."""
+    idx = np.rint(np.asarray(positions, dtype=np.float64) * (len(lut) - 1)).astype(np.int64)
+    return np.asarray(lut)[idx]
+
+
+def _quantize(colors, n):
+    """
+    Counterpart of d3 `quantize(scaleLinear().domain(range(0, 1 + 1 / m, 1 / (m - 1))).range(colors), n)`
+    (as used in getAsymmetricDivergingColors): `n` evenly spaced colors of the piecewise
+    linear sRGB scale going through the m `colors`. Returns lowercase '#rrggbb' strings.
+    """
+    rgb = parse_colors(colors).astype(np.float64)
+    m = len(rgb)
+    if m == 1:
+        return to_hex(np.repeat(rgb, n, axis=0).astype(np.uint8))
+    t = np.arange(n) / (n - 1) if n > 1 else np.zeros(1)
+    domain = np.arange(m) * (1 / (m - 1))
+    # Same segment lookup as the bisection of d3-scale polymap
+    seg = np.searchsorted(domain[1:m - 1], t, side='right')
+    frac = ((t - domain[seg]) / (domain[seg + 1] - domain[seg]))[:, None]
+    mixed = rgb[seg] + frac * (rgb[seg + 1] - rgb[seg])
+    # Math.round, as d3-color does when formatting the interpolated colors
+    return to_hex(np.clip(np.floor(mixed + 0.5), 0, 255).astype(np.uint8))
+
+
+def asymmetric_diverging_colors(name, class_left, class_right, central_class=True, balanced=False,
+                                reversed=False, catalogue=None):
+    """
+    Port of getAsymmetricDivergingColors: colors for an asymmetric diverging
+    palette, picked in the designed variations of the diverging palette `name`
+    (and only interpolated when no variation is long enough, or short enough).
+
+    `class_left` colors are taken on the left and `class_right` colors on the
+    right (with the central color in between if `central_class` is True). If
+    `balanced` is True, the color progression is the same on both sides. If
+    `reversed` is True, the order of the colors is reversed.
+
+    Returns a list of '#rrggbb' strings, of length class_left + class_right (+ 1).
+    """
+    if class_left < 1:
+        raise ValueError('1 class or more are required on the left')
+    if class_right < 1:
+        raise ValueError('1 class or more are required on the right')
+
+    catalogue = catalogue or default_catalogue()
+    palettes = sorted(catalogue.get_palettes(name=name), key=lambda p: p['number'])
+    if not palettes:
+        raise ValueError(f'No palette found for {name}')
+    if palettes[0]['type'] != 'diverging':
+        raise ValueError(f'{name} is not a diverging scheme')
+
+    def find(*tests):
+        for test in tests:
+            for p in palettes:
+                if test(p['number']):
+                    return p
+        raise ValueError(
+            f'Not enough variations of the {name} palette available to interpolate to the required parameters'
+        )
+
+    def variation(number):
+        colors = catalogue.get_colors(name, number)
+        if colors is None:
+            raise ValueError(f'No palette found for {name} with {number} classes')
+        return colors
+
+    def longest(odd):
+        # Longest variation with an odd (or even) number of classes
+        last = palettes[-1]
+        return last if last['number'] % 2 == odd else palettes[-2]
+
+    def result(colors):
+        return colors[::-1] if reversed else colors
+
+    # Special case when only two classes are requested but this kind of scheme starts at 3 classes
+    if not central_class and class_left == 1 and class_right == 1 and palettes[0]['number'] > 2:
+        colors = find(lambda n: n == 2, lambda n: n % 2 == 0)['colors']
+        return result([colors[0], colors[-1]])
+
+    # Special case when the number of classes is 1 on both sides
+    if central_class and class_left == 1 and class_right == 1:
+        colors = find(lambda n: n == 3, lambda n: n % 2 != 0)['colors']
+        return result([colors[0], colors[len(colors) // 2], colors[-1]])
+
+    if class_left == class_right:
+        balanced = True
+
+    # The colors are reversed at the end, so the left and right sides are swapped
+    if reversed:
+        class_left, class_right = class_right, class_left
+
+    first_length = len(palettes[0]['colors'])
+    last_length = len(palettes[-1]['colors'])
+
+    if not balanced:
+        colors = []
+        cl2 = class_left * 2
+        cr2 = class_right * 2
+
+        if cl2 > last_length or cl2 < first_length:
+            # The central class (of the palettes with an odd number of classes) is skipped
+            pal = longest(odd=False)
+            base = pal['colors'][:pal['number'] // 2]
+            colors += [base[0]] if class_left == 1 else _quantize(base, class_left)
+        else:
+            colors += variation(cl2)[:class_left]
+
+        if central_class:
+            pal = find(lambda n: n == 3, lambda n: n % 2 != 0)['colors']
+            colors.append(pal[len(pal) // 2])
+
+        if cr2 > last_length or cr2 < first_length:
+            pal = longest(odd=False)
+            base = pal['colors'][pal['number'] // 2:pal['number']]
+            colors += [base[-1]] if class_right == 1 else _quantize(base, class_right)
+        else:
+            colors += variation(cr2)[cr2 - class_right:cr2]
+
+        return result(colors)
+
+    n = max(class_left, class_right)
+    n_colors = n * 2 + int(central_class)
+
+    if n_colors > last_length or n_colors < first_length:
+        ref = longest(odd=central_class)
+        central = ref['colors'][len(ref['colors']) // 2] if central_class else None
+        if central_class and len(ref['colors']) < 4:
+            ref = find(lambda n: n == 4)
+
+        number = ref['number']
+        colors_left = _quantize(ref['colors'][:number // 2], n)
+        colors_right = _quantize(ref['colors'][(number + 1) // 2:number], n)
+        colors = colors_left[n - class_left:]
+        if central is not None:
+            colors.append(central)
+        colors += colors_right[:class_right]
+    else:
+        ref = variation(n_colors)
+        middle = ref[n:n + 1] if central_class else []
+        if class_right > class_left:
+            colors = ref[class_right - class_left:class_right] + middle + ref[class_right + int(central_class):]
+        else:
+            diff = class_left - class_right
+            colors = ref[:class_left] + middle + ref[len(ref) - class_right - diff:len(ref) - diff]
+
+    return result(colors)
+
+
+def approximate_asymmetric_diverging_colors(lut, class_left, class_right, central_class=True, balanced=False,
+                                            reversed=False):
+    """
+    Approximation of `asymmetric_diverging_colors` working on the LUT of a
+    diverging palette (or on any list of colors): `class_left` colors are
+    sampled in the left half of the LUT and `class_right` colors in the right
+    half (with the color at the middle of the LUT in between if `central_class`
+    is True). If `balanced` is True, the color progression is the same on both
+    sides (the side with the fewest classes only uses the colors closest to the
+    center). If `reversed` is True, the order of the colors is reversed.
+
+    The colors are interpolated in the LUT, so they generally differ from the
+    colors of the designed variations of the palette.
+
+    Returns an (n, 3) uint8 array, with n = class_left + class_right (+ 1).
+    """
+    if class_left < 1:
+        raise ValueError('1 class or more are required on the left')
+    if class_right < 1:
+        raise ValueError('1 class or more are required on the right')
+    if class_left == class_right:
+        balanced = True
+    if reversed:
+        class_left, class_right = class_right, class_left
+
+    steps_left = max(class_left, class_right) if balanced else class_left
+    steps_right = max(class_left, class_right) if balanced else class_right
+    # From the extremity of each side towards the center (which is excluded)
+    left = 0.5 * np.arange(steps_left - class_left, steps_left) / steps_left
+    right = 1 - 0.5 * np.arange(steps_right - class_right, steps_right)[::-1] / steps_right
+    positions = np.concatenate([left, [0.5] if central_class else [], right])
+    colors = sample_lut(_as_lut(lut), positions)
+    return colors[::-1] if reversed else colors
+
+
+def map_values(array, palette, vmin=None, vmax=None, classes=None, vcenter=None,
+               balanced=False, nan_color=(0, 0, 0), approximate=False):
+    """
+    Map the values of `array` to colors with one vectorized gather.
+
+    `palette` is a palette name, a (256, 3) LUT or a list of colors.
+    Values are linearly mapped from [vmin, vmax] (the range of the finite
+    values by default) to the palette; values outside of this range get the
+    color of the closest bound, and NaN get `nan_color`.
+
+    - `classes=None`: continuous mapping on the 256 colors of the LUT,
+    - `classes=n`: n equal-interval classes between vmin and vmax,
+    - `classes=(left, right)`: asymmetric diverging classes (as in
+      getAsymmetricDivergingColors, without central class): `left` classes
+      between vmin and `vcenter` and `right` classes between `vcenter` and vmax
+      (`vcenter` being the middle of [vmin, vmax] by default). The colors come
+      from `asymmetric_diverging_colors` when `palette` is a name, or from
+      `approximate_asymmetric_diverging_colors` (sampled in the LUT) when
+      `approximate` is True or when `palette` is not a name.
+
+    With `vcenter` (and no classes, or asymmetric classes), the left half of the
+    palette is used for [vmin, vcenter] and the right half for [vcenter, vmax].
+
+    Returns an array of shape array.shape + (3,) of uint8 RGB values.
+    """
+    values = np.asarray(array)
+    if not np.issubdtype(values.dtype, np.floating):
+        values = values.astype(np.float64)
+    nan = np.isnan(values)
+    if vmin is None or vmax is None:
+        finite = values[np.isfinite(values)]
+        if vmin is None:
+            vmin = finite.min() if finite.size else 0.0
+        if vmax is None:
+            vmax = finite.max() if finite.size else 1.0
+    lut = _as_lut(palette)
+    t = _normalize(values, vmin, vmax, vcenter)
+
+    if isinstance(classes, (tuple, list)):
+        class_left, class_right = classes
+        if isinstance(palette, str) and not approximate:
+            colors = parse_colors(asymmetric_diverging_colors(palette, class_left, class_right, False, balanced))
+        else:
+            colors = approximate_asymmetric_diverging_colors(lut, class_left, class_right, False, balanced)
+        # The left half of [0, 1] is split in class_left classes, the right half in class_right classes
+        idx = np.where(
+            t < 0.5,
+            np.floor(t * (2 * class_left)),
+            class_left + np.floor((t - 0.5) * (2 * class_right)),
+        )
+    elif classes is not None:
+        colors = sample_lut(lut, np.linspace(0, 1, classes))
+        idx = np.floor(t * classes, out=t)
+    else:
+        colors = np.asarray(lut)
+        idx = np.rint(t * (len(colors) - 1), out=t)
+
+    np.clip(idx, 0, len(colors) - 1, out=idx)
+    # NaN are mapped to an extra color at the end of the table
+    idx[nan] = len(colors)
+    table = np.concatenate([colors, np.asarray([nan_color], dtype=np.uint8)])
+    return table[idx.astype(np.intp)]
+
+
+def _normalize(values, vmin, vmax, vcenter=None):
+    """Linearly map values to [0, 1] (with vcenter mapped to 0.5 if given)."""
+    with np.errstate(invalid='ignore'):
+        if vcenter is None:
+            t = values - vmin
+            t *= 1 / (vmax - vmin) if vmax != vmin else 0
+        else:
+            # Left half for [vmin, vcenter], right half for [vcenter, vmax]
+            left = 0.5 / (vcenter - vmin) if vcenter != vmin else 0
+            right = 0.5 / (vmax - vcenter) if vmax != vcenter else 0
+            t = values - vcenter
+            t *= np.where(t < 0, left, right)
+            t += 0.5
+    # With a zero-width range, inf * 0 gives NaN: infinite values are clamped to the bounds explicitly
+    t[np.isposinf(values)] = 1
+    t[np.isneginf(values)] = 0
+    return np.clip(t, 0, 1, out=t)
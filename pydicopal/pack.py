@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+"""
+Packed binary representation of the palette catalogue.
+
+All the colors are stored as consecutive RGB bytes in a buffer, next to
+a small JSON index (provider -> name -> number -> [offset, length, upper],
+offset and length being in bytes), so that a consumer only has to decode the
+palettes it asks for. `upper` is a bitmask whose bit i is set when the i-th
+color is written in uppercase in palettes.json, so that decoded colors keep
+their case.
+The catalogue can also be split into one buffer (and index) per provider.
+"""
+import json
+from pathlib import Path
+
+import numpy as np
+
+from .cache import write_if_changed
+from .color import compress_colors, to_hex
+
+
+def _case_mask(text):
+    """Bitmask of the uppercase colors of a compressed string (bit i for the i-th color)."""
+    mask = 0
+    for i in range(0, len(text), 6):
+        color = text[i:i + 6]
+        if color != color.lower():
+            if color != color.upper():
+                raise ValueError(f'Cannot pack the color {color!r}, which mixes lowercase and uppercase')
+            mask |= 1 << (i // 6)
+    return mask
+
+
+def pack(res):
+    """
+    Pack the palette descriptions `res` (as written to palettes.json).
+
+    Returns the RGB buffer (bytes) and its index.
+    """
+    chunks = []
+    offset = 0
+    index = {}
+    for provider, palettes in res.items():
+        index[provider] = {}
+        for name, desc in palettes.items():
+            entry = {k: v for k, v in desc.items() if k != 'values'}
+            entry['values'] = {}
+            for number, colors in desc['values'].items():
+                text = colors if isinstance(colors, str) else compress_colors(colors)
+                buf = bytes.fromhex(text)
+                entry['values'][str(number)] = [offset, len(buf), _case_mask(text)]
+                chunks.append(buf)
+                offset += len(buf)
+            index[provider][name] = entry
+    return b''.join(chunks), index
+
+
+def write_packed(res, directory, basename='palettes', shard=False):
+    """
+    Write the packed catalogue to `directory`, either as `{basename}.bin`
+    and `{basename}.index.json`, or, if `shard` is True, as one
+    `{basename}.{provider}.bin` / `{basename}.{provider}.index.json` pair
+    per provider.
+
+    Returns the paths of the files that were actually (re)written.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    parts = [(f'{basename}.{p}', {p: res[p]}) for p in res] if shard else [(basename, res)]
+    written = []
+    for stem, section in parts:
+        buf, index = pack(section)
+        bin_path = directory / f'{stem}.bin'
+        if write_if_changed(bin_path, buf):
+            written.append(bin_path)
+        index_path = directory / f'{stem}.index.json'
+        if write_if_changed(index_path, json.dumps(index, separators=(',', ':'))):
+            written.append(index_path)
+    return written
+
+
+def load_packed(directory, basename='palettes'):
+    """
+    Read the palette descriptions back from the packed catalogue written to
+    `directory` by `write_packed` (as a single buffer or as one shard per provider).
+
+    Returns None if there is no packed catalogue in `directory`.
+    """
+    directory = Path(directory)
+    single = directory / f'{basename}.bin'
+    paths = [single] if single.exists() else sorted(directory.glob(f'{basename}.*.bin'))
+    if not paths:
+        return None
+    res = {}
+    for path in paths:
+        res.update(PackedCatalogue(path).descriptions())
+    return res
+
+
+class PackedCatalogue:
+    """
+    Read-only access to a packed catalogue (or to one of its shards).
+    The buffer is memory-mapped, and only the requested palettes are decoded.
+    """
+    def __init__(self, bin_path, index_path=None):
+        bin_path = Path(bin_path)
+        if index_path is None:
+            index_path = bin_path.with_suffix('.index.json')
+        with open(index_path) as f:
+            self.index = json.load(f)
+        self.buffer = np.memmap(bin_path, dtype=np.uint8, mode='r') if bin_path.stat().st_size else np.zeros(0, np.uint8)
+
+    def rgb(self, provider, name, number):
+        """Return the colors of a palette as an (n, 3) uint8 array."""
+        offset, length, _ = self.index[provider][name]['values'][str(number)]
+        return np.asarray(self.buffer[offset:offset + length]).reshape(-1, 3)
+
+    def colors(self, provider, name, number):
+        """Return the colors of a palette as a list of '#rrggbb' strings (in the case of palettes.json)."""
+        mask = self.index[provider][name]['values'][str(number)][2]
+        colors = to_hex(self.rgb(provider, name, number))
+        return [c.upper() if mask >> i & 1 else c for i, c in enumerate(colors)]
+
+    def descriptions(self):
+        """Return the palette descriptions (provider -> name -> {type, values, url}) of the catalogue."""
+        res = {}
+        for provider, palettes in self.index.items():
+            res[provider] = {}
+            for name, entry in palettes.items():
+                desc = {k: v for k, v in entry.items() if k != 'values'}
+                desc['values'] = {
+                    number: compress_colors(self.colors(provider, name, number)) for number in entry['values']
+                }
+                res[provider][name] = desc
+        return res
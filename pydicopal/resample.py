@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+"""
+Resampling of long color ramps (such as the ones from Joshua Stevens)
+into discrete palettes.
+
+A ramp is parsed once into an (N, 3) array and every requested number
+of classes is computed in a single batched gather, whatever the length
+of the ramp.
+"""
+import numpy as np
+
+from .color import compress_colors, lab_to_rgb, parse_colors, rgb_to_lab, to_hex
+
+MODES = ('index', 'rgb', 'lab')
+
+
+def _positions(length, counts):
+    """
+    Compute the (fractional) positions, in a ramp of `length` colors,
+    of the samples for each number of classes in `counts`.
+
+    Returns the positions of all the samples (concatenated) and the offsets
+    at which the samples of each number of classes start.
+    """
+    counts = np.asarray(counts, dtype=np.int64)
+    if counts.size == 0 or counts.min() < 2:
+        raise ValueError('At least 2 classes are required')
+    offsets = np.concatenate([[0], np.cumsum(counts)])
+    n = np.repeat(counts, counts)
+    i = np.arange(offsets[-1]) - np.repeat(offsets[:-1], counts)
+    # Same float arithmetic as the historical, one-color-at-a-time, implementation
+    step = (length - 1) / (n - 1)
+    return i * step, offsets
+
+
+def sample_all(ramp, max_classes=20, min_classes=2, mode='index'):
+    """
+    Resample a color ramp for every number of classes between
+    `min_classes` and `max_classes` (both included).
+
+    `ramp` is a sequence of '#rrggbb' strings, a compressed string or an
+    (N, 3) array. `mode` is one of:
+    - 'index': pick the color at the truncated position in the ramp
+      (the first and the last colors are always kept),
+    - 'rgb': linear interpolation between the two closest colors in sRGB,
+    - 'lab': linear interpolation between the two closest colors in CIELAB.
+
+    Returns a dict mapping each number of classes to an (n, 3) uint8 array.
+    """
+    if mode not in MODES:
+        raise ValueError(f'Unknown resampling mode {mode!r} (expected one of {MODES})')
+    rgb = ramp if isinstance(ramp, np.ndarray) else parse_colors(ramp)
+    length = len(rgb)
+    counts = np.arange(min_classes, max_classes + 1)
+    pos, offsets = _positions(length, counts)
+
+    if mode == 'index':
+        idx = pos.astype(np.int64)
+        # Always end on the last color of the ramp
+        idx[offsets[1:] - 1] = length - 1
+        out = rgb[idx]
+    else:
+        lo = np.minimum(pos.astype(np.int64), length - 2)
+        frac = (pos - lo)[:, None]
+        space = rgb.astype(np.float64) if mode == 'rgb' else rgb_to_lab(rgb)
+        mixed = space[lo] * (1 - frac) + space[lo + 1] * frac
+        if mode == 'rgb':
+            out = np.rint(np.clip(mixed, 0, 255)).astype(np.uint8)
+        else:
+            out = lab_to_rgb(mixed)
+
+    return {
+        int(n): out[offsets[k]:offsets[k + 1]]
+        for k, n in enumerate(counts)
+    }
+
+
+def sample_all_compressed(ramp, max_classes=20, min_classes=2, mode='index'):
+    """
+    Same as `sample_all` but returns the palettes in the compressed
+    representation used in palettes.json.
+    """
+    return {
+        n: compress_colors(colors)
+        for n, colors in sample_all(ramp, max_classes, min_classes, mode).items()
+    }
+
+
+def sample(palette, num_samples, mode='index'):
+    """Resample a color ramp to `num_samples` colors, returned as '#rrggbb' strings."""
+    return to_hex(sample_all(palette, num_samples, num_samples, mode)[num_samples])
+
+
+def interpolate(startcolor, goalcolor):
+    """
+    Return the color halfway between `startcolor` and `goalcolor`
+    (both given as '#rrggbb' strings), as a '#rrggbb' string.
+    """
+    a, b = parse_colors([startcolor, goalcolor]).astype(np.int64)
+    return to_hex((a + (b - a) / 2).astype(np.uint8)[None])[0]
@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+"""
+Search of the palettes of the catalogue that are the closest to a given
+list of colors.
+
+Each palette variation is described by a fixed-length CIELAB feature
+vector: its colors are resampled (by linear interpolation in CIELAB) to
+`FEATURE_STOPS` stops, either in their original order, or sorted by
+lightness for order-insensitive (e.g. qualitative) comparisons.
+
+At the size of the catalogue (a few thousands of vectors), one matrix
+operation over all the feature vectors is faster than walking a KD-tree,
+and type / provider / number filters are simple masks, so the index is
+stored as plain arrays (a .npz file next to palettes.json).
+"""
+import io
+import json
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+
+from .cache import write_if_changed
+from .catalogue import SRC_DIR
+from .color import parse_colors, rgb_to_lab
+
+FEATURE_STOPS = 8
+
+DEFAULT_INDEX_PATH = SRC_DIR / 'similarity.npz'
+
+
+def features(palettes, ordered=True, stops=FEATURE_STOPS):
+    """
+    Compute the feature vectors of a (P, n, 3) array of P palettes of
+    n sRGB colors. Returns a (P, stops * 3) array.
+    """
+    lab = rgb_to_lab(np.asarray(palettes))
+    if not ordered:
+        order = np.argsort(lab[..., 0], axis=-1, kind='stable')
+        lab = np.take_along_axis(lab, order[..., None], axis=1)
+    n = lab.shape[1]
+    if n == 1:
+        return np.repeat(lab, stops, axis=1).reshape(len(lab), -1)
+    pos = np.linspace(0, n - 1, stops)
+    lo = np.minimum(pos.astype(np.int64), n - 2)
+    frac = (pos - lo)[None, :, None]
+    resampled = lab[:, lo] * (1 - frac) + lab[:, lo + 1] * frac
+    return resampled.reshape(len(lab), -1)
+
+
+def build_index(res, stops=FEATURE_STOPS):
+    """
+    Build the similarity index of the palette descriptions `res`.
+
+    Returns a dict with the metadata of each palette variation ('ids',
+    'names', 'numbers', 'types', 'providers', in the order of `res`) and
+    the 'ordered' and 'unordered' (P, stops * 3) feature matrices.
+    """
+    meta = {'ids': [], 'names': [], 'numbers': [], 'types': [], 'providers': []}
+    colors = []
+    for provider, palettes in res.items():
+        for name, desc in palettes.items():
+            for number, values in desc['values'].items():
+                meta['ids'].append(f'{name}_{number}')
+                meta['names'].append(name)
+                meta['numbers'].append(int(number))
+                meta['types'].append(desc['type'])
+                meta['providers'].append(provider)
+                colors.append(parse_colors(values))
+
+    index = {k: np.array(v) for k, v in meta.items()}
+    for key, ordered in (('ordered', True), ('unordered', False)):
+        mat = np.zeros((len(colors), stops * 3))
+        # Palettes are stacked by number of colors
+        for n in np.unique(index['numbers']):
+            members = np.flatnonzero(index['numbers'] == n)
+            mat[members] = features(np.stack([colors[k] for k in members]), ordered, stops)
+        index[key] = mat
+    return index
+
+
+def write_index(index, path=DEFAULT_INDEX_PATH):
+    """Write the similarity index to `path` (.npz), unless it did not change. Returns whether it was written."""
+    buf = io.BytesIO()
+    np.savez(buf, **index)
+    return write_if_changed(path, buf.getvalue())
+
+
+@lru_cache(maxsize=None)
+def load_index(path=DEFAULT_INDEX_PATH):
+    """
+    Load the similarity index from `path`, or build it from the
+    palettes.json file of this repository if it was not generated.
+    """
+    if Path(path).exists():
+        with np.load(path) as data:
+            return {k: data[k] for k in data.files}
+    with open(SRC_DIR / 'palettes.json') as f:
+        return build_index(json.load(f))
+
+
+def nearest_palettes(colors, k=5, type=None, provider=None, number=None, ordered=True, index=None):
+    """
+    Find the `k` palettes closest to `colors` (a list of '#rrggbb' strings).
+
+    Palettes can be filtered by `type`, `provider` and `number` of classes.
+    With `ordered=False`, the order of the colors is ignored (which suits
+    qualitative palettes).
+
+    Returns a list of (palette id, provider, distance) tuples, from the closest
+    palette, the distance being the root mean square CIELAB difference between
+    the feature stops.
+    """
+    if index is None:
+        index = load_index()
+    key = 'ordered' if ordered else 'unordered'
+    mat = index[key]
+    stops = mat.shape[1] // 3
+    query = features(parse_colors(colors)[None], ordered, stops)[0]
+
+    mask = np.ones(len(mat), dtype=bool)
+    if type:
+        mask &= index['types'] == type.lower()
+    if provider:
+        mask &= index['providers'] == provider.lower()
+    if number:
+        mask &= index['numbers'] == int(number)
+    candidates = np.flatnonzero(mask)
+
+    dist = np.sqrt(((mat[candidates] - query) ** 2).sum(axis=1) / stops)
+    k = min(k, len(candidates))
+    best = np.argpartition(dist, k - 1)[:k] if k else np.array([], dtype=np.int64)
+    best = best[np.argsort(dist[best], kind='stable')]
+    return [
+        (str(index['ids'][candidates[i]]), str(index['providers'][candidates[i]]), float(dist[i]))
+        for i in best
+    ]
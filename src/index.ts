@@ -77,22 +77,56 @@ export type Palette = {
 
 type PaletteDescriptionsType = { [key in Provider]: { [key in string]: any } };
 
-const paletteDescriptions: PaletteDescriptionsType = (() => {
-  const uncompressColors = (colors: string): string[] => {
-    const res = [];
-    for (let i = 0; i < colors.length; i += 6) {
-      res.push(`#${colors.slice(i, i + 6)}`);
-    }
-    return res;
+const uncompressColors = (colors: string): string[] => {
+  const res = [];
+  for (let i = 0; i < colors.length; i += 6) {
+    res.push(`#${colors.slice(i, i + 6)}`);
+  }
+  return res;
+};
+
+/**
+ * Wrap the compressed colors of the variations of a palette so that each of them
+ * is only decoded when it is accessed for the first time (the decoded colors are
+ * then stored in place of the getter).
+ *
+ * @param {Object} values - Compressed colors, by number of classes
+ * @returns {Object} - Colors, by number of classes
+ */
+const lazyValues = (values: { [key: string]: string }): { [key: string]: string[] } => {
+  const res: { [key: string]: string[] } = {};
+  const store = (number: string, colors: string[]) => {
+    Object.defineProperty(res, number, {
+      configurable: true,
+      enumerable: true,
+      writable: true,
+      value: colors,
+    });
   };
+  Object.keys(values).forEach((number) => {
+    Object.defineProperty(res, number, {
+      configurable: true,
+      enumerable: true,
+      get() {
+        const colors = uncompressColors(values[number]);
+        store(number, colors);
+        return colors;
+      },
+      set(colors: string[]) {
+        store(number, colors);
+      },
+    });
+  });
+  return res;
+};
 
+// Palettes are only decoded when they are requested for the first time,
+// instead of decoding the whole catalogue when the module is imported.
+const paletteDescriptions: PaletteDescriptionsType = (() => {
   Object.keys(data).forEach((provider) => {
     Object.keys(data[provider as Provider]).forEach((name) => {
       // @ts-ignore
-      Object.keys(data[provider as Provider][name].values).forEach((number) => {
-        // @ts-ignore
-        data[provider as Provider][name].values[number] = uncompressColors(data[provider as Provider][name].values[number])
-      });
+      data[provider as Provider][name].values = lazyValues(data[provider as Provider][name].values);
     });
   });
   return data;
@@ -101,6 +135,25 @@ const paletteDescriptions: PaletteDescriptionsType = (() => {
 const allProviders = Object.keys(paletteDescriptions);
 const allTypes = Object.keys(PaletteType)
   .map((key) => PaletteType[key as keyof typeof PaletteType]);
+const cbfIds = new Set(cbf);
+
+const makePalette = (provider: string, name: string, number: string): Palette => {
+  const description = paletteDescriptions[provider as Provider][name];
+  const o = {
+    id: `${name}_${number}`,
+    name,
+    number: parseInt(number, 10),
+    type: description.type as PaletteType,
+    colors: description.values[number],
+    provider: provider as Provider,
+    url: description.url,
+  };
+  if (cbfIds.has(o.id)) {
+    // @ts-ignore
+    o.cbf = true;
+  }
+  return o as Palette;
+};
 
 /**
  * @description Get a palette, given a name and number of classes. If no palette is found, undefined is returned.
@@ -112,20 +165,7 @@ export const getPalette = (name: string, number: number): Palette | undefined =>
   for (let i = 0; i < allProviders.length; i++) {
     const provider = allProviders[i];
     if (paletteDescriptions[provider as Provider][name]?.values[`${number}`]) {
-      const o = {
-        id: `${name}_${number}`,
-        name,
-        number,
-        type: paletteDescriptions[provider as Provider][name].type as PaletteType,
-        colors: paletteDescriptions[provider as Provider][name].values[`${number}`],
-        provider: provider as Provider,
-        url: paletteDescriptions[provider as Provider][name].url,
-      };
-      if (cbf.includes(o.id)) {
-        // @ts-ignore
-        o.cbf = true;
-      }
-      return o as Palette;
+      return makePalette(provider, name, `${number}`);
     }
   }
   return undefined;
@@ -181,24 +221,9 @@ const getAllPalettes = (): Palette[] => {
   allProviders.forEach((provider) => {
     const names = Object.keys(paletteDescriptions[provider as Provider]);
     names.forEach((name) => {
-      const type = paletteDescriptions[provider as Provider][name].type as PaletteType;
-      const url = paletteDescriptions[provider as Provider][name].url;
       const numbers = Object.keys(paletteDescriptions[provider as Provider][name].values);
       numbers.forEach((number) => {
-        const o = {
-          id: `${name}_${number}`,
-          name,
-          number: parseInt(number, 10),
-          type,
-          colors: paletteDescriptions[provider as Provider][name].values[number],
-          provider: provider as Provider,
-          url,
-        };
-        if (cbf.includes(o.id)) {
-          // @ts-ignore
-          o.cbf = true;
-        }
-        res.push(o as Palette);
+        res.push(makePalette(provider, name, number));
       });
     });
   });
@@ -223,22 +248,30 @@ export const getPalettes = (
 ): Palette[] => {
   const { type, number, provider, name } = options;
 
-  const allPalettes = getAllPalettes();
   // If there is no criteria, return all palettes.
-  if (!type && !number && !provider && !name) return allPalettes;
+  if (!type && !number && !provider && !name) return getAllPalettes();
 
   const _type = type ? type.toLowerCase() : undefined;
   const _provider = provider ? provider.toLowerCase() : undefined;
   const _name = name ? name.toLowerCase() : undefined;
 
-  // Find palettes that match the requested criteria.
-  return allPalettes.filter((palette) => {
-    if (type && palette.type !== _type) return false;
-    if (number && palette.number !== number) return false;
-    if (provider && palette.provider !== _provider) return false;
-    if (name && palette.name.toLowerCase() !== _name) return false;
-    return true;
+  // Find palettes that match the requested criteria
+  // (the colors are only decoded for the matching palettes).
+  const res: Palette[] = [];
+  allProviders.forEach((p) => {
+    if (provider && p !== _provider) return;
+    const names = Object.keys(paletteDescriptions[p as Provider]);
+    names.forEach((n) => {
+      if (name && n.toLowerCase() !== _name) return;
+      if (type && paletteDescriptions[p as Provider][n].type !== _type) return;
+      const numbers = Object.keys(paletteDescriptions[p as Provider][n].values);
+      numbers.forEach((num) => {
+        if (number && parseInt(num, 10) !== number) return;
+        res.push(makePalette(p, n, num));
+      });
+    });
   });
+  return res;
 }
 
 /**
@@ -1,9 +1,12 @@
 import {
   addPalette,
   getAsymmetricDivergingColors,
+  getColors,
   getPalette,
   getPalettes,
+  getRawData,
   getSequentialColors,
+  Provider,
 } from '../src';
 
 describe('getPalette', () => {
@@ -27,6 +30,84 @@ describe('getPalette', () => {
   });
 });
 
+describe('lazy decoding of the palettes', () => {
+  const rawValues = (provider: Provider, name: string) => (
+    getRawData(provider) as { [key: string]: any }
+  )[name].values;
+
+  it('should decode a palette on first access, and return the same array afterwards', () => {
+    const values = rawValues(Provider.WESANDERSON, 'Cavalcanti');
+    // Not decoded yet
+    expect(Object.getOwnPropertyDescriptor(values, '5')!.get).toBeDefined();
+
+    const palette = getPalette('Cavalcanti', 5);
+    expect(palette!.colors).toEqual(['#D1AA00', '#083213', '#929460', '#6F9879', '#842111']);
+    // The decoded colors are stored in place of the getter
+    const descriptor = Object.getOwnPropertyDescriptor(values, '5')!;
+    expect(descriptor.get).toBeUndefined();
+    expect(descriptor.value).toBe(palette!.colors);
+    expect(getPalette('Cavalcanti', 5)!.colors).toBe(palette!.colors);
+    expect(getColors('Cavalcanti', 5)).toBe(palette!.colors);
+  });
+
+  it('should expose the variations as regular enumerable properties', () => {
+    const values = rawValues(Provider.COLORBREWER, 'Blues');
+    expect(Object.keys(values)).toEqual(['3', '4', '5', '6', '7', '8', '9']);
+
+    const serialized = JSON.parse(JSON.stringify(values));
+    expect(Object.keys(serialized)).toEqual(['3', '4', '5', '6', '7', '8', '9']);
+    expect(serialized['3']).toEqual(['#DEEBF7', '#9ECAE1', '#3182BD']);
+    Object.keys(serialized).forEach((number) => {
+      expect(serialized[number]).toEqual(getColors('Blues', parseInt(number, 10)));
+    });
+  });
+});
+
+describe('getPalettes', () => {
+  // Reference implementation: filter the list of all the palettes
+  const filterPalettes = (
+    options: { type?: string, number?: number, provider?: string, name?: string },
+  ) => {
+    const { type, number, provider, name } = options;
+    return getPalettes().filter((palette) => {
+      if (type && palette.type !== type.toLowerCase()) return false;
+      if (number && palette.number !== number) return false;
+      if (provider && palette.provider !== provider.toLowerCase()) return false;
+      if (name && palette.name.toLowerCase() !== name.toLowerCase()) return false;
+      return true;
+    });
+  };
+
+  it('should return all the palettes when no criteria is provided', () => {
+    const all = getPalettes();
+    expect(all.length).toBe(
+      Object.values(getRawData() as { [key: string]: any })
+        .map((palettes) => Object.values(palettes)
+          .map((desc: any) => Object.keys(desc.values).length)
+          .reduce((a, b) => a + b, 0))
+        .reduce((a, b) => a + b, 0),
+    );
+    expect(getPalettes({})).toEqual(all);
+  });
+
+  it('should return the same palettes as filtering all the palettes, for every combination of criteria', () => {
+    const types = [undefined, 'sequential', 'Diverging', 'qualitative', 'unknown'];
+    const numbers = [undefined, 3, 9, 12000];
+    const providers = [undefined, 'colorbrewer', 'CartoColors', 'scientific', 'unknown'];
+    const names = [undefined, 'Blues', 'rdbu', 'Vivid', 'Unknown'];
+    for (const type of types) {
+      for (const number of numbers) {
+        for (const provider of providers) {
+          for (const name of names) {
+            const options = { type, number, provider, name };
+            expect(getPalettes(options)).toEqual(filterPalettes(options));
+          }
+        }
+      }
+    }
+  });
+});
+
 describe('getSequentialColors', () => {
   it('should return a palette when the name exists, without interpolation if not needed', () => {
     const colors = getSequentialColors('Blues', 4);
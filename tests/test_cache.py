@@ -0,0 +1,51 @@
+from pathlib import Path
+
+from pydicopal import color
+from pydicopal.cache import BuildCache, hash_parts, sample_all_cached, write_if_changed
+from pydicopal.resample import sample_all_compressed
+
+RAMP = ['#000000', '#333333', '#666666', '#999999', '#cccccc', '#ffffff']
+
+
+def test_cached_sections_are_reused(tmp_path):
+    cache = BuildCache(tmp_path)
+    first = sample_all_cached(cache, 'ramp', RAMP, 5)
+    assert first == sample_all_compressed(RAMP, 5)
+    assert (cache.hits, cache.misses) == ([], ['ramp'])
+
+    cache = BuildCache(tmp_path)
+    second = sample_all_cached(cache, 'ramp', RAMP, 5)
+    assert second == first
+    assert list(second) == [2, 3, 4, 5]
+    assert (cache.hits, cache.misses) == (['ramp'], [])
+
+    # Changing the sources invalidates the cached section
+    sample_all_cached(cache, 'ramp', RAMP[::-1], 5)
+    assert cache.misses == ['ramp']
+
+
+def test_changed_color_helpers_invalidate_the_cache(tmp_path, monkeypatch):
+    cache = BuildCache(tmp_path / 'cache')
+    sample_all_cached(cache, 'ramp', RAMP, 5)
+    # Same ramp, but the color helpers used to compute the section changed
+    patched = tmp_path / 'color.py'
+    patched.write_bytes(Path(color.__file__).read_bytes() + b'\n# changed\n')
+    monkeypatch.setattr(color, '__file__', str(patched))
+    cache = BuildCache(tmp_path / 'cache')
+    sample_all_cached(cache, 'ramp', RAMP, 5)
+    assert cache.misses == ['ramp']
+
+
+def test_disabled_cache(tmp_path):
+    cache = BuildCache(tmp_path, enabled=False)
+    cache.put('section', hash_parts(1), {'a': {'values': {}}})
+    assert cache.get('section', hash_parts(1)) is None
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_write_if_changed(tmp_path):
+    path = tmp_path / 'out.json'
+    assert write_if_changed(path, '{}')
+    assert not write_if_changed(path, '{}')
+    assert write_if_changed(path, '[]')
+    assert path.read_text() == '[]'
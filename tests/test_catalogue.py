@@ -0,0 +1,59 @@
+from pydicopal.catalogue import Catalogue, get_colors, get_palette, get_palette_by_id, get_palettes
+
+RES = {
+    'provider1': {
+        'Pal': {'type': 'sequential', 'values': {'2': '000000ffffff', '3': '000000808080ffffff'}, 'url': 'https://a'},
+        'Other': {'type': 'qualitative', 'values': {'2': 'ff000000ff00'}, 'url': 'https://b'},
+    },
+    'provider2': {
+        'Pal': {'type': 'diverging', 'values': {3: ['#ff0000', '#ffffff', '#0000ff']}, 'url': 'https://c'},
+    },
+}
+
+
+def test_get_palette():
+    cat = Catalogue(RES, cbf=['Pal_3'])
+    assert cat.get_palette('Pal', 3) == {
+        'id': 'Pal_3',
+        'name': 'Pal',
+        'number': 3,
+        'type': 'sequential',
+        'colors': ['#000000', '#808080', '#ffffff'],
+        'provider': 'provider1',
+        'url': 'https://a',
+        'cbf': True,
+    }
+    assert cat.get_palette('Pal', 4) is None
+    assert cat.get_palette('Nope', 3) is None
+    assert cat.get_palette_by_id('Other_2')['provider'] == 'provider1'
+    assert cat.get_palette_by_id('Other') is None
+
+
+def test_get_colors_returns_copies():
+    cat = Catalogue(RES)
+    colors = cat.get_colors('Other', 2)
+    colors.append('#000000')
+    assert cat.get_colors('Other', 2) == ['#ff0000', '#00ff00']
+    assert cat.get_colors('Other', 2, reverse=True) == ['#00ff00', '#ff0000']
+    assert cat.get_colors_by_id('Pal_2', True) == ['#ffffff', '#000000']
+
+
+def test_get_palettes():
+    cat = Catalogue(RES)
+    assert len(cat.get_palettes()) == 4
+    assert [p['id'] for p in cat.get_palettes(name='pal')] == ['Pal_2', 'Pal_3', 'Pal_3']
+    assert [p['provider'] for p in cat.get_palettes(name='PAL', number=3)] == ['provider1', 'provider2']
+    assert cat.get_palettes(type='Diverging')[0]['colors'] == ['#ff0000', '#ffffff', '#0000ff']
+    assert cat.get_palettes(provider='provider2', type='sequential') == []
+    assert cat.get_palette_numbers('Pal') == [2, 3, 3]
+
+
+def test_default_catalogue():
+    palette = get_palette('Pastel', 4)
+    assert palette['colors'] == ['#66C5CC', '#F6CF71', '#F89C74', '#DCB0F2']
+    assert palette['provider'] == 'cartocolors'
+    assert get_palette_by_id('Pastel_4') == palette
+    assert get_colors('Pastel', 4, reverse=True) == ['#DCB0F2', '#F89C74', '#F6CF71', '#66C5CC']
+    palettes = get_palettes(number=3)
+    assert len(palettes) > 100
+    assert all(p['number'] == 3 for p in palettes)
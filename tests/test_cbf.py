@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+from pydicopal.cbf import ciede2000, classify, min_distances, simulate
+
+
+@pytest.mark.parametrize('lab1, lab2, expected', [
+    # Reference values from Sharma, Wu & Dalal (2005)
+    ((50, 2.6772, -79.7751), (50, 0, -82.7485), 2.0425),
+    ((50, 2.5, 0), (73, 25, -18), 27.1492),
+    ((60.2574, -34.0099, 36.2677), (60.4626, -34.1751, 39.4387), 1.2644),
+    ((50, 2.5, 0), (50, 0, -2.5), 4.3065),
+    ((2.0776, 0.0795, -1.1350), (0.9033, -0.0636, -0.5514), 0.9082),
+])
+def test_ciede2000(lab1, lab2, expected):
+    assert ciede2000(np.array(lab1), np.array(lab2)) == pytest.approx(expected, abs=1e-4)
+
+
+def test_simulation_keeps_greys():
+    greys = np.array([[0, 0, 0], [128, 128, 128], [255, 255, 255]])
+    for deficiency in ('protanopia', 'deuteranopia', 'tritanopia'):
+        sim = simulate(greys, deficiency)
+        assert np.allclose(sim, sim[:, :1], atol=1e-3)
+
+
+def test_red_green_palette_is_not_colorblind_friendly():
+    res = {
+        'p': {
+            'RedGreen': {'type': 'qualitative', 'values': {2: 'd62728' '2ca02c'}},
+            'Greys': {'type': 'sequential', 'values': {3: 'ffffff' '969696' '000000'}},
+        },
+    }
+    cbf, scores = classify(res)
+    assert cbf == ['Greys_3']
+    assert scores['RedGreen_2']['normal'] > 30
+    assert scores['RedGreen_2']['deuteranopia'] < 8
+    # Batched computation gives the same result as the palette-by-palette one
+    dist = min_distances(np.array([[[214, 39, 40], [44, 160, 44]]]))
+    assert dist['deuteranopia'][0] == pytest.approx(scores['RedGreen_2']['deuteranopia'], abs=0.01)
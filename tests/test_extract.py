@@ -0,0 +1,44 @@
+import json
+import sys
+
+import pytest
+
+from pydicopal.extract import MODULES, bare_palettable, extract_all, extract_module, parse_palette_name
+
+
+def test_parse_palette_name():
+    assert parse_palette_name('Blues_9') == ('Blues', False)
+    assert parse_palette_name('Blues_9_r') == ('Blues_9_r', True)
+    assert parse_palette_name('Viridis_20') == ('Viridis', False)
+    assert parse_palette_name('Safe') == ('Safe', False)
+
+
+def test_parallel_extraction_is_deterministic():
+    pytest.importorskip('palettable')
+    modules = MODULES[:6]
+    serial = extract_all(modules)
+    parallel = extract_all(modules, workers=3)
+    assert json.dumps(serial) == json.dumps(parallel)
+    assert list(serial) == ['cartocolors', 'cmocean', 'colorbrewer']
+    assert all(d['url'] == 'https://colorbrewer2.org/' for d in serial['colorbrewer'].values())
+
+
+def _unload_palettable(monkeypatch):
+    for name in [m for m in sys.modules if m == 'palettable' or m.startswith('palettable.')]:
+        monkeypatch.delitem(sys.modules, name)
+
+
+def test_bare_palettable_does_not_leak(monkeypatch):
+    pytest.importorskip('palettable')
+    _unload_palettable(monkeypatch)
+    with bare_palettable():
+        assert extract_module('tableau')
+        assert 'palettable.tableau' in sys.modules
+        assert 'palettable.colorbrewer' not in sys.modules
+    assert not [m for m in sys.modules if m.startswith('palettable')]
+
+    # Outside of the context, palettable is imported as usual
+    extract_module('tableau')
+    import palettable
+    assert palettable.__version__
+    assert palettable.colorbrewer.sequential.Blues_3.number == 3
@@ -0,0 +1,114 @@
+import importlib.util
+import json
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from pydicopal import extract
+
+pytest.importorskip('palettable')
+
+ROOT = Path(__file__).resolve().parent.parent
+
+_spec = importlib.util.spec_from_file_location('generator', ROOT / 'generate-palette-descriptions.py')
+generator = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(generator)
+
+
+def _read(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def test_full_generation(tmp_path):
+    # No palettes.json exists yet in the output directory
+    generator.main(['--output', str(tmp_path), '--no-cache'])
+    assert (tmp_path / 'palettes.json').read_bytes() == (ROOT / 'src' / 'palettes.json').read_bytes()
+    assert (tmp_path / 'cbf.json').exists() and (tmp_path / 'cbf-scores.json').exists()
+
+
+def test_refresh_keeps_other_providers(tmp_path):
+    reference = _read(ROOT / 'src' / 'palettes.json')
+    # Existing file with a modified provider, and the providers in another order
+    existing = dict(reversed(list(reference.items())))
+    existing['cmocean'] = {'Custom': {'type': 'sequential', 'values': {'2': 'AbCdEf123456'}}}
+    with open(tmp_path / 'palettes.json', 'w') as f:
+        json.dump(existing, f, indent=4)
+
+    generator.main(['--providers', 'tableau', '--output', str(tmp_path), '--no-cache'])
+    res = _read(tmp_path / 'palettes.json')
+    assert list(res) == generator.PROVIDERS
+    for provider in res:
+        expected = reference[provider] if provider == 'tableau' else existing[provider]
+        assert json.dumps(res[provider], indent=4) == json.dumps(expected, indent=4)
+
+
+@pytest.mark.parametrize('options', [[], ['--format', 'packed'], ['--format', 'packed', '--shard']])
+def test_refresh_keeps_other_packed_providers(tmp_path, options):
+    generator.main(['--output', str(tmp_path), '--no-cache', *options])
+    full = {path.name: path.read_bytes() for path in tmp_path.iterdir()}
+    generator.main(['--providers', 'tableau', '--output', str(tmp_path), '--no-cache', *options])
+    # The catalogue (and its classification) is still the one of a full run
+    assert {path.name: path.read_bytes() for path in tmp_path.iterdir()} == full
+
+
+@pytest.mark.parametrize('options', [[], ['--format', 'packed'], ['--format', 'packed', '--shard']])
+def test_refresh_without_existing_catalogue(tmp_path, options):
+    with pytest.raises(SystemExit):
+        generator.main(['--providers', 'joshuastevens', '--output', str(tmp_path), '--no-cache', *options])
+    assert not (tmp_path / 'cbf.json').exists()
+
+
+def test_max_classes(tmp_path):
+    shutil.copy(ROOT / 'src' / 'palettes.json', tmp_path)
+    generator.main(['--providers', 'joshuastevens', '--max-classes', '5', '--output', str(tmp_path), '--no-cache'])
+    res = _read(tmp_path / 'palettes.json')['joshuastevens']
+    assert res
+    assert all(list(desc['values']) == ['2', '3', '4', '5'] for desc in res.values())
+
+
+def test_unchanged_outputs_are_not_rewritten(tmp_path):
+    args = ['--output', str(tmp_path), '--cache-dir', str(tmp_path / 'cache'), '--luts', '--similarity-index']
+    generator.main(args)
+    outputs = ['palettes.json', 'cbf.json', 'cbf-scores.json', 'luts.npy', 'luts.json', 'similarity.npz']
+    mtimes = {name: (tmp_path / name).stat().st_mtime_ns for name in outputs}
+    generator.main(args)
+    assert {name: (tmp_path / name).stat().st_mtime_ns for name in outputs} == mtimes
+
+
+def test_only_selected_submodules_are_imported(tmp_path, monkeypatch):
+    for name in [m for m in sys.modules if m == 'palettable' or m.startswith('palettable.')]:
+        monkeypatch.delitem(sys.modules, name)
+    imported = set()
+    extract_module = extract.extract_module
+
+    def spy(provider, kind=''):
+        fragment = extract_module(provider, kind)
+        imported.update(m for m in sys.modules if m.startswith('palettable.'))
+        return fragment
+
+    monkeypatch.setattr(extract, 'extract_module', spy)
+    shutil.copy(ROOT / 'src' / 'palettes.json', tmp_path)
+    generator.main(['--providers', 'tableau', '--output', str(tmp_path), '--no-cache'])
+
+    assert 'palettable.tableau' in imported
+    others = {provider for provider, _ in extract.MODULES} - {'tableau'}
+    assert not [m for m in imported if m.split('.')[1] in others]
+    # The bare palettable package does not outlive the generation
+    assert 'palettable' not in sys.modules
+
+
+def test_optional_stages_are_not_imported():
+    code = (
+        'import importlib.util, json, sys\n'
+        f'spec = importlib.util.spec_from_file_location("generator", {str(ROOT / "generate-palette-descriptions.py")!r})\n'
+        'spec.loader.exec_module(importlib.util.module_from_spec(spec))\n'
+        'print(json.dumps([m for m in sys.modules if m.startswith("pydicopal.")]))\n'
+    )
+    out = subprocess.run([sys.executable, '-c', code], cwd=ROOT, check=True, capture_output=True, text=True).stdout
+    loaded = json.loads(out)
+    assert 'pydicopal.extract' in loaded
+    assert not {'pydicopal.catalogue', 'pydicopal.lut', 'pydicopal.similarity'} & set(loaded)
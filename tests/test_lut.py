@@ -0,0 +1,156 @@
+import numpy as np
+import pytest
+
+from pydicopal.color import to_hex
+from pydicopal.catalogue import Catalogue, get_palettes
+from pydicopal.lut import (
+    approximate_asymmetric_diverging_colors,
+    asymmetric_diverging_colors,
+    build_lut,
+    build_luts,
+    load_luts,
+    map_values,
+    write_luts,
+)
+
+GREYS = ['#000000', '#ffffff']
+# A diverging LUT going from pure red (left) to pure blue (right), through white
+DIVERGING = build_lut(['#ff0000', '#ffffff', '#0000ff'])
+
+
+def test_build_lut():
+    lut = build_lut(GREYS)
+    assert lut.shape == (256, 3) and lut.dtype == np.uint8
+    assert (lut[:, 0] == np.arange(256)).all()
+
+
+def test_build_and_load_luts(tmp_path):
+    res = {
+        'p': {
+            'Seq': {'type': 'sequential', 'values': {'2': '000000ffffff', '3': '000000ff0000ffffff'}},
+            'Qual': {'type': 'qualitative', 'values': {'2': '000000ffffff'}},
+        },
+    }
+    names, luts = build_luts(res, ramps={'Other': GREYS})
+    assert names == ['Seq']
+    assert to_hex(luts[0, [0, 255]]) == ['#000000', '#ffffff']
+    assert np.abs(luts[0, 128].astype(int) - [255, 0, 0]).max() <= 2
+    assert write_luts(names, luts, tmp_path / 'luts.npy') == [tmp_path / 'luts.npy', tmp_path / 'luts.json']
+    # Not rewritten when the LUTs did not change
+    assert write_luts(names, luts, tmp_path / 'luts.npy') == []
+    index, loaded = load_luts(tmp_path / 'luts.npy')
+    assert isinstance(loaded, np.memmap)
+    assert (loaded[index['Seq']] == luts[0]).all()
+
+
+def test_map_values_continuous():
+    values = np.array([[-10, 0, 50], [100, 200, np.nan]])
+    out = map_values(values, GREYS, 0, 100, nan_color=(1, 2, 3))
+    assert out.shape == (2, 3, 3)
+    assert out[..., 0].tolist() == [[0, 0, 128], [255, 255, 1]]
+    assert out[1, 2].tolist() == [1, 2, 3]
+    # Infinite values with a zero-width range (on one side of vcenter, or overall)
+    assert map_values(np.array([5.0, np.inf]), GREYS)[:, 0].tolist() == [0, 255]
+    assert map_values(np.array([5, -np.inf]), GREYS, 0, 10, vcenter=0)[:, 0].tolist() == [191, 0]
+
+
+def test_map_values_classes():
+    out = map_values(np.array([0, 24, 26, 74, 76, 100]), GREYS, 0, 100, classes=2)
+    assert out[:, 0].tolist() == [0, 0, 0, 255, 255, 255]
+
+
+def test_approximate_asymmetric_diverging():
+    colors = approximate_asymmetric_diverging_colors(DIVERGING, 1, 3)
+    assert len(colors) == 5
+    assert to_hex(colors[[0, -1]]) == ['#ff0000', '#0000ff']
+    assert colors[1].min() >= 250
+    balanced = approximate_asymmetric_diverging_colors(DIVERGING, 1, 3, central_class=False, balanced=True)
+    assert len(balanced) == 4
+    # With a balanced progression, the only color on the left is the one closest to the center
+    assert balanced[0, 0] == 255 and 128 < balanced[0, 1] < 255
+    assert (balanced[1:] == colors[2:]).all()
+    assert (approximate_asymmetric_diverging_colors(DIVERGING, 3, 1, reversed=True) == colors[::-1]).all()
+
+    out = map_values(np.array([0, 19, 21, 60, 100]), DIVERGING, 0, 100, classes=(1, 3), vcenter=20)
+    assert to_hex(out[[0, 1]]) == ['#ff0000', '#ff0000']
+    assert to_hex(out[[-1]]) == ['#0000ff']
+    assert out[2, 2] == 255 and out[2, 0] > out[3, 0]
+
+
+def test_asymmetric_diverging_known_results():
+    # Results of getAsymmetricDivergingColors for the same parameters
+    assert asymmetric_diverging_colors('RdBu', 2, 3) == [
+        '#CA0020', '#F4A582', '#F7F7F7', '#D1E5F0', '#67A9CF', '#2166AC',
+    ]
+    assert asymmetric_diverging_colors('RdBu', 3, 2, reversed=True) == [
+        '#2166AC', '#67A9CF', '#D1E5F0', '#F7F7F7', '#F4A582', '#CA0020',
+    ]
+    assert asymmetric_diverging_colors('RdBu', 1, 1) == ['#EF8A62', '#F7F7F7', '#67A9CF']
+    # 14 colors on the left: interpolated from the left half of RdBu_10
+    colors = asymmetric_diverging_colors('RdBu', 7, 8)
+    assert colors[:3] == ['#67001f', '#991027', '#be3036']
+    assert colors[7] == '#F7F7F7'
+    assert colors[-1] == '#053061'
+
+
+def test_asymmetric_diverging_lengths():
+    names = sorted({p['name'] for p in get_palettes(type='diverging')})
+    for name in names:
+        for left in range(1, 9):
+            for right in range(1, 9):
+                for central_class in (True, False):
+                    for balanced in (True, False):
+                        colors = asymmetric_diverging_colors(name, left, right, central_class, balanced)
+                        assert len(colors) == left + right + central_class
+                        assert all(len(c) == 7 and c.startswith('#') for c in colors)
+
+
+def test_asymmetric_diverging_reversed_and_balanced():
+    for left, right in ((2, 3), (7, 8)):
+        for central_class in (True, False):
+            for balanced in (True, False):
+                colors = asymmetric_diverging_colors('Balance', right, left, central_class, balanced)
+                assert asymmetric_diverging_colors('Balance', left, right, central_class, balanced, True) == colors[::-1]
+    for n in range(1, 16):
+        for central_class in (True, False):
+            assert (
+                asymmetric_diverging_colors('Balance', n, n, central_class, True)
+                == asymmetric_diverging_colors('Balance', n, n, central_class, False)
+            )
+
+
+def test_asymmetric_diverging_custom_catalogue():
+    cat = Catalogue({
+        'MyOrg': {
+            'NewDiverging': {
+                'type': 'diverging',
+                'values': {
+                    '5': 'D7191CFDAE61d7d7d7ABDDA435AF24',
+                    '4': 'D7191Cefc091b8e1b235AF24',
+                },
+            },
+        },
+    })
+    for central_class in (True, False):
+        for balanced in (True, False):
+            colors = asymmetric_diverging_colors('NewDiverging', 3, 5, central_class, balanced, catalogue=cat)
+            assert len(colors) == 8 + central_class
+            if central_class:
+                assert colors[3] == '#d7d7d7'
+                assert asymmetric_diverging_colors('NewDiverging', 5, 3, True, balanced, catalogue=cat)[5] == '#d7d7d7'
+
+
+def test_map_values_asymmetric_classes_by_name():
+    out = map_values(np.array([0, 10, 30, 60, 90]), 'RdBu', 0, 100, classes=(2, 3), vcenter=20)
+    assert to_hex(out) == ['#ca0020', '#f4a582', '#d1e5f0', '#67a9cf', '#2166ac']
+
+
+def test_invalid_classes():
+    with pytest.raises(ValueError):
+        approximate_asymmetric_diverging_colors(DIVERGING, 0, 3)
+    with pytest.raises(ValueError):
+        asymmetric_diverging_colors('RdBu', 3, 0)
+    with pytest.raises(ValueError):
+        asymmetric_diverging_colors('NonExistent', 3, 3)
+    with pytest.raises(ValueError):
+        asymmetric_diverging_colors('Blues', 3, 3)
@@ -0,0 +1,76 @@
+import json
+
+import pytest
+
+from pydicopal.catalogue import Catalogue
+from pydicopal.pack import PackedCatalogue, load_packed, pack, write_packed
+
+RES = {
+    'provider1': {
+        'Pal': {'type': 'sequential', 'values': {2: '000000FFFFFF', 3: '000000808080ffffff'}, 'url': 'https://a'},
+    },
+    'provider2': {
+        'Other': {'type': 'qualitative', 'values': {2: 'ff000000ff00'}, 'url': 'https://b'},
+    },
+    'provider3': {
+        'Mixed': {'type': 'diverging', 'values': {3: 'D7191Cd7d7d735AF24'}},
+    },
+}
+
+
+def test_pack_index():
+    buf, index = pack(RES)
+    assert len(buf) == 30
+    assert index['provider1']['Pal']['values'] == {'2': [0, 6, 2], '3': [6, 9, 0]}
+    assert index['provider2']['Other'] == {'type': 'qualitative', 'url': 'https://b', 'values': {'2': [15, 6, 0]}}
+
+
+def test_packed_catalogue(tmp_path):
+    written = write_packed(RES, tmp_path)
+    assert sorted(p.name for p in written) == ['palettes.bin', 'palettes.index.json']
+    # Nothing is rewritten when the catalogue did not change
+    assert write_packed(RES, tmp_path) == []
+
+    cat = PackedCatalogue(tmp_path / 'palettes.bin')
+    assert cat.colors('provider1', 'Pal', 3) == ['#000000', '#808080', '#ffffff']
+    assert cat.rgb('provider2', 'Other', 2).tolist() == [[255, 0, 0], [0, 255, 0]]
+    # The case of the colors of palettes.json is kept
+    assert cat.colors('provider1', 'Pal', 2) == ['#000000', '#FFFFFF']
+    assert cat.colors('provider3', 'Mixed', 3) == ['#D7191C', '#d7d7d7', '#35AF24']
+    assert pack(RES)[1]['provider3']['Mixed']['values'] == {'3': [21, 9, 5]}
+
+
+def test_mixed_case_color():
+    with pytest.raises(ValueError):
+        pack({'p': {'Pal': {'type': 'sequential', 'values': {2: 'aBcDeF000000'}}}})
+
+
+def test_packed_colors_match_catalogue(tmp_path):
+    catalogue = Catalogue.from_files()
+    write_packed(catalogue.res, tmp_path)
+    packed = PackedCatalogue(tmp_path / 'palettes.bin')
+    for provider, name, number, _ in catalogue.entries:
+        colors = packed.colors(provider, name, number)
+        assert colors == catalogue.get_palettes(provider=provider, name=name, number=number)[0]['colors']
+
+
+def test_sharded_output(tmp_path):
+    write_packed(RES, tmp_path, shard=True)
+    with open(tmp_path / 'palettes.provider2.index.json') as f:
+        assert list(json.load(f)) == ['provider2']
+    cat = PackedCatalogue(tmp_path / 'palettes.provider2.bin')
+    assert cat.colors('provider2', 'Other', 2) == ['#ff0000', '#00ff00']
+
+
+def test_load_packed(tmp_path):
+    assert load_packed(tmp_path) is None
+    expected = {
+        provider: {
+            name: {**desc, 'values': {str(n): v for n, v in desc['values'].items()}} for name, desc in palettes.items()
+        }
+        for provider, palettes in RES.items()
+    }
+    write_packed(RES, tmp_path / 'single')
+    assert load_packed(tmp_path / 'single') == expected
+    write_packed(RES, tmp_path / 'shards', shard=True)
+    assert load_packed(tmp_path / 'shards') == expected
@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from pydicopal import interpolate, parse_colors, sample, sample_all, to_hex
+
+
+def legacy_sample(palette, num_samples):
+    # Historical implementation, kept as a reference for the 'index' mode
+    step_size = (len(palette) - 1) / (num_samples - 1)
+    sampled = [palette[0]]
+    for i in range(1, num_samples - 1):
+        sampled.append(palette[int(i * step_size)])
+    sampled.append(palette[-1])
+    return sampled
+
+
+@pytest.fixture(params=[3, 17, 256, 1024])
+def ramp(request):
+    rng = np.random.default_rng(request.param)
+    return to_hex(rng.integers(0, 256, (request.param, 3), dtype=np.uint8))
+
+
+def test_index_mode_matches_legacy_sampling(ramp):
+    res = sample_all(ramp, 20)
+    assert sorted(res) == list(range(2, 21))
+    for n, colors in res.items():
+        assert to_hex(colors) == legacy_sample(ramp, n)
+
+
+def test_interpolation_modes_keep_endpoints(ramp):
+    for mode in ('rgb', 'lab'):
+        for n, colors in sample_all(ramp, 12, mode=mode).items():
+            assert colors.shape == (n, 3)
+            assert to_hex(colors[[0, -1]]) == [ramp[0], ramp[-1]]
+
+
+def test_sample_and_interpolate():
+    assert sample(['#000000', '#808080', '#ffffff'], 2) == ['#000000', '#ffffff']
+    assert sample(['#000000', '#ffffff'], 3, mode='rgb') == ['#000000', '#808080', '#ffffff']
+    assert interpolate('#000000', '#ffffff') == '#7f7f7f'
+    assert interpolate('#0a0b0c', '#050607') == '#070809'
+    assert parse_colors('ff000000ff00').tolist() == [[255, 0, 0], [0, 255, 0]]
+
+
+def test_invalid_parameters():
+    with pytest.raises(ValueError):
+        sample_all(['#000000', '#ffffff'], 1, 1)
+    with pytest.raises(ValueError):
+        sample_all(['#000000', '#ffffff'], mode='hsl')
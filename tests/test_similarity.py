@@ -0,0 +1,46 @@
+import numpy as np
+
+from pydicopal.similarity import build_index, features, load_index, nearest_palettes, write_index
+
+RES = {
+    'p1': {
+        'Reds': {'type': 'sequential', 'values': {'3': 'fee0d2fc9272de2d26', '4': 'fee5d9fcae91fb6a4acb181d'}},
+        'Mixed': {'type': 'qualitative', 'values': {'3': 'e41a1c377eb84daf4a'}},
+    },
+    'p2': {
+        'Blues': {'type': 'sequential', 'values': {'3': 'deebf79ecae13182bd'}},
+    },
+}
+
+
+def test_features_have_a_fixed_length():
+    assert features(np.zeros((2, 3, 3), np.uint8)).shape == (2, 24)
+    assert features(np.zeros((1, 11, 3), np.uint8), stops=4).shape == (1, 12)
+
+
+def test_nearest_palettes():
+    index = build_index(RES)
+    res = nearest_palettes(['#fee0d2', '#fc9272', '#de2d26'], k=2, index=index)
+    assert res[0][:2] == ('Reds_3', 'p1')
+    assert res[0][2] < 1e-6
+    assert res[1][0] == 'Reds_4'
+    assert nearest_palettes(['#fee0d2', '#de2d26'], index=index, provider='p2')[0][0] == 'Blues_3'
+    assert [r[0] for r in nearest_palettes(['#fee0d2'], index=index, number=4)] == ['Reds_4']
+
+
+def test_order_insensitive_search():
+    index = build_index(RES)
+    shuffled = ['#4daf4a', '#e41a1c', '#377eb8']
+    ordered = nearest_palettes(shuffled, k=1, type='qualitative', index=index)
+    unordered = nearest_palettes(shuffled, k=1, type='qualitative', ordered=False, index=index)
+    assert ordered[0][0] == unordered[0][0] == 'Mixed_3'
+    assert unordered[0][2] < 1e-6 < ordered[0][2]
+
+
+def test_index_roundtrip(tmp_path):
+    assert write_index(build_index(RES), tmp_path / 'similarity.npz')
+    # Not rewritten when the index did not change
+    assert not write_index(build_index(RES), tmp_path / 'similarity.npz')
+    index = load_index(tmp_path / 'similarity.npz')
+    assert list(index['ids']) == ['Reds_3', 'Reds_4', 'Mixed_3', 'Blues_3']
+    assert nearest_palettes(['#deebf7', '#3182bd'], k=1, index=index)[0][0] == 'Blues_3'